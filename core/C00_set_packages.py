@@ -86,6 +86,7 @@ import csv                                               # CSV reader/writer
 from dataclasses import dataclass                        # Data class decorator
 import datetime as dt                                    # Primary datetime module (aliased)
 from datetime import date, timedelta, datetime           # Common date utilities
+from functools import lru_cache                          # Memoisation decorator
 import getpass                                           # Get current username (useful for WSL/paths)
 import glob                                              # Wildcard file matching
 import hashlib                                           # Standard library hashing (MD5/SHA families)
@@ -234,6 +235,7 @@ __all__ = [
     "date",
     "timedelta",
     "datetime",
+    "lru_cache",
     "getpass",
     "glob",
     "hashlib",
@@ -361,6 +361,10 @@ def create_table_with_toolbar(
 # Row insertion, selection, and clearing utilities.
 # ====================================================================================================
 
+# --- Zebra tag tuples (shared across rows; tags themselves are configured in make_zebra_treeview) ---
+_ODD: tuple[str] = ("odd",)
+_EVEN: tuple[str] = ("even",)
+
 def insert_rows(
     treeview: ttk.Treeview,
     rows: list[tuple[Any, ...]],
@@ -385,8 +389,7 @@ def insert_rows(
         Use clear_existing=True for full data refresh.
     """
     if clear_existing:
-        for item in treeview.get_children():
-            treeview.delete(item)
+        clear_table(treeview)
 
     item_ids: list[str] = []
     for row in rows:
@@ -417,11 +420,23 @@ def insert_rows_zebra(
         None.
 
     Notes:
-        Combines insert_rows() + apply_zebra_striping(). Requires tags configured.
+        Tags each row at insert time rather than re-tagging the whole table afterwards.
+        When appending to a non-empty table, falls back to apply_zebra_striping().
+        Requires tags configured (create_table / make_zebra_treeview do this once).
+        Does not pump the event loop; Tk redraws once when the caller returns to idle.
     """
-    item_ids = insert_rows(treeview, rows, clear_existing)
-    apply_zebra_striping(treeview)
-    return item_ids
+    if clear_existing:
+        clear_table(treeview)
+    elif treeview.get_children():
+        item_ids = insert_rows(treeview, rows)
+        apply_zebra_striping(treeview)
+        return item_ids
+
+    insert = treeview.insert
+    return [
+        insert("", "end", values=row, tags=_ODD if i & 1 == 0 else _EVEN)
+        for i, row in enumerate(rows)
+    ]
 
 
 def get_selected_values(treeview: ttk.Treeview) -> list[tuple[Any, ...]]:
@@ -452,6 +467,29 @@ def get_selected_values(treeview: ttk.Treeview) -> list[tuple[Any, ...]]:
     return results
 
 
+def focus_row(treeview: ttk.Treeview, item_id: str) -> None:
+    """
+    Description:
+        Select, focus, and scroll to a single row.
+
+    Args:
+        treeview: The Treeview widget.
+        item_id: Item ID of the row to focus.
+
+    Returns:
+        None.
+
+    Raises:
+        None.
+
+    Notes:
+        Use after a full refresh to restore the user's place in the table.
+    """
+    treeview.selection_set(item_id)
+    treeview.focus(item_id)
+    treeview.see(item_id)
+
+
 def clear_table(treeview: ttk.Treeview) -> None:
     """
     Description:
@@ -467,10 +505,11 @@ def clear_table(treeview: ttk.Treeview) -> None:
         None.
 
     Notes:
-        Preserves column configuration.
+        Preserves column configuration. Deletes all rows in a single Tcl call.
     """
-    for item in treeview.get_children():
-        treeview.delete(item)
+    children = treeview.get_children()
+    if children:
+        treeview.delete(*children)
 
 
 # ====================================================================================================
@@ -495,6 +534,7 @@ __all__ = [
     "insert_rows",
     "insert_rows_zebra",
     "get_selected_values",
+    "focus_row",
     "clear_table",
 ]
 
@@ -606,6 +646,10 @@ def main() -> None:
         assert len(selected) == 1
         logger.info("get_selected_values() returned %d rows", len(selected))
 
+        focus_row(zebra_result.treeview, item_ids[-1])
+        assert zebra_result.treeview.focus() == item_ids[-1]
+        logger.info("focus_row() verified")
+
         clear_table(horiz_result.treeview)
         assert len(horiz_result.treeview.get_children()) == 0
         logger.info("clear_table() verified")
@@ -616,7 +660,7 @@ def main() -> None:
         assert basic_result.scrollbar_y is not None
         logger.info("create_table() created (not displayed)")
 
-        logger.info("[G03d] All assertions passed (9 functions tested).")
+        logger.info("[G03d] All assertions passed (10 functions tested).")
         root.mainloop()
 
     except Exception as exc:
@@ -274,9 +274,15 @@ class MfcMappingsDialog:
             self.count_label.configure(text=f"{count} mapping(s)")
 
     def destroy(self) -> None:
-        """Close and destroy the dialog."""
-        if self.dialog:
-            self.dialog.destroy()
+        """Close and destroy the dialog (safe to call more than once).
+
+        Any open child dialogs (entry forms) are Toplevels of this window, so Tk
+        destroys them as part of this single call.
+        """
+        if self.dialog is None:
+            return
+        dialog, self.dialog = self.dialog, None
+        dialog.destroy()
 
 
 # ====================================================================================================
@@ -340,6 +346,7 @@ class MfcMappingEntryDialog:
             modal=True,
             resizable=False,
         )
+        self.dialog.protocol("WM_DELETE_WINDOW", self.destroy)
 
         # Main frame
         main_frame = make_frame(self.dialog, padding="MD")
@@ -400,9 +407,11 @@ class MfcMappingEntryDialog:
         return dr_name, gp_name
 
     def destroy(self) -> None:
-        """Close and destroy the dialog."""
-        if self.dialog:
-            self.dialog.destroy()
+        """Close and destroy the dialog (safe to call more than once)."""
+        if self.dialog is None:
+            return
+        dialog, self.dialog = self.dialog, None
+        dialog.destroy()
 
 
 # ====================================================================================================
@@ -429,6 +438,11 @@ class UnmappedMfcDialog:
         on_set_name: Callback for set button.
         on_continue: Callback for continue button.
         on_cancel: Callback for cancel button.
+
+    Notes:
+        Never call dialog.update() from this class or its controller; it pumps user
+        events mid-handler. Use update_idletasks() if geometry must be flushed
+        (make_dialog already does this before centring and grab_set).
     """
 
     def __init__(self) -> None:
@@ -441,6 +455,10 @@ class UnmappedMfcDialog:
         self.status_label: Any = None
         self.result: Dict[str, bool] = {"completed": False}
 
+        # Debounced status update state (see update_status)
+        self._status_pending: bool = False
+        self._pending_remaining: int = 0
+
         # Callbacks
         self.on_set_name: Callable[[], None] | None = None
         self.on_continue: Callable[[], None] | None = None
@@ -464,6 +482,7 @@ class UnmappedMfcDialog:
             modal=True,
             resizable=True,
         )
+        self.dialog.protocol("WM_DELETE_WINDOW", self.destroy)
 
         # Main frame
         main_frame = make_frame(self.dialog, padding="MD")
@@ -536,9 +555,24 @@ class UnmappedMfcDialog:
     def update_status(self, remaining: int) -> None:
         """Update status label and continue button state.
 
+        Updates are coalesced: only the latest count is applied, once per idle cycle.
+
         Args:
             remaining: Number of unmapped items remaining.
         """
+        self._pending_remaining = remaining
+        if self._status_pending or self.dialog is None:
+            return
+        self._status_pending = True
+        self.dialog.after_idle(self._flush_status)
+
+    def _flush_status(self) -> None:
+        """Apply the most recent remaining count to the label and Continue button."""
+        self._status_pending = False
+        if self.dialog is None:
+            return
+
+        remaining = self._pending_remaining
         if self.status_label:
             self.status_label.configure(text=f"{remaining} remaining to map")
         if self.continue_btn:
@@ -547,6 +581,22 @@ class UnmappedMfcDialog:
             else:
                 self.continue_btn.configure(state="disabled")
 
+    def set_saving(self, saving: bool) -> None:
+        """Lock the dialog while mappings are written in the background.
+
+        Args:
+            saving: True to disable buttons and show "Saving…", False to restore.
+        """
+        if self.dialog is None:
+            return
+        state = "disabled" if saving else "normal"
+        for btn in (self.set_btn, self.continue_btn, self.cancel_btn):
+            if btn:
+                btn.configure(state=state)
+        if saving and self.status_label:
+            self.status_label.configure(text="Saving…")
+        self.dialog.protocol("WM_DELETE_WINDOW", (lambda: None) if saving else self.destroy)
+
     def wait_for_close(self) -> bool:
         """Block until dialog closes.
 
@@ -566,9 +616,11 @@ class UnmappedMfcDialog:
         self.result["completed"] = completed
 
     def destroy(self) -> None:
-        """Close and destroy the dialog."""
-        if self.dialog:
-            self.dialog.destroy()
+        """Close and destroy the dialog (safe to call more than once)."""
+        if self.dialog is None:
+            return
+        dialog, self.dialog = self.dialog, None
+        dialog.destroy()
 
 
 # ====================================================================================================
@@ -585,16 +637,22 @@ class SetGopuffNameDialog:
 
     Attributes:
         dialog: The Toplevel window.
+        dr_label: Label showing the Deliveroo name being mapped.
         gp_entry: Entry for GoPuff name.
         save_btn: Save button.
         cancel_btn: Cancel button.
         on_save: Callback for save.
         on_cancel: Callback for cancel.
+
+    Notes:
+        Same redraw contract as UnmappedMfcDialog: update_idletasks() only, never update().
+        Build once, then reuse via reconfigure() + show() / hide() instead of rebuilding.
     """
 
     def __init__(self) -> None:
         """Initialise dialog with empty widget references."""
         self.dialog: Any = None
+        self.dr_label: Any = None
         self.gp_entry: Any = None
         self.save_btn: Any = None
         self.cancel_btn: Any = None
@@ -627,6 +685,7 @@ class SetGopuffNameDialog:
             modal=True,
             resizable=False,
         )
+        self.dialog.protocol("WM_DELETE_WINDOW", self.destroy)
 
         # Main frame
         main_frame = make_frame(self.dialog, padding="MD")
@@ -634,12 +693,13 @@ class SetGopuffNameDialog:
         main_frame.columnconfigure(1, weight=1)
 
         # Deliveroo name label
-        make_label(
+        self.dr_label = make_label(
             main_frame,
             text=f"Deliveroo: {deliveroo_name}",
             size="SMALL",
             bold=True,
-        ).grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, SPACING_SM))
+        )
+        self.dr_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, SPACING_SM))
 
         # GoPuff name entry
         make_label(main_frame, text="GoPuff Name:", size="SMALL").grid(
@@ -678,10 +738,39 @@ class SetGopuffNameDialog:
         """
         return self.gp_entry.get().strip() if self.gp_entry else ""
 
+    def reconfigure(self, deliveroo_name: str, initial_value: str = "") -> None:
+        """Point an already-built dialog at another Deliveroo name.
+
+        Args:
+            deliveroo_name: Deliveroo name being mapped (shown as label).
+            initial_value: Initial value for GoPuff name field.
+        """
+        self.dr_label.configure(text=f"Deliveroo: {deliveroo_name}")
+        self.gp_entry.delete(0, "end")
+        if initial_value:
+            self.gp_entry.insert(0, initial_value)
+
+    def show(self) -> None:
+        """Re-display a hidden dialog modally and focus the entry."""
+        if self.dialog is None:
+            return
+        self.dialog.deiconify()
+        self.dialog.grab_set()
+        self.gp_entry.focus_set()
+
+    def hide(self) -> None:
+        """Hide the dialog without destroying its widgets (for reuse)."""
+        if self.dialog is None:
+            return
+        self.dialog.grab_release()
+        self.dialog.withdraw()
+
     def destroy(self) -> None:
-        """Close and destroy the dialog."""
-        if self.dialog:
-            self.dialog.destroy()
+        """Close and destroy the dialog (safe to call more than once)."""
+        if self.dialog is None:
+            return
+        dialog, self.dialog = self.dialog, None
+        dialog.destroy()
 
 
 # ====================================================================================================
@@ -35,7 +35,7 @@ if project_root not in sys.path:
 if "" in sys.path:
     sys.path.remove("")
 
-sys.dont_write_bytecode = True
+# Bytecode suppression is set by the launcher (G10b Section 1) before this module is imported.
 
 
 # ====================================================================================================
@@ -57,6 +57,7 @@ from gui.G02a_widget_primitives import (
 from gui.G03d_table_patterns import (
     insert_rows_zebra,
     get_selected_values,
+    focus_row,
 )
 
 # --- G20a: Dialog Designs --------------------------------------------------------------------------
@@ -135,12 +136,17 @@ def show_mfc_mappings_dialog(
     # HELPER FUNCTIONS
     # ------------------------------------------------------------------------------------------------
 
-    def refresh_table() -> None:
-        """Clear and repopulate the table with zebra striping."""
-        rows = [(dr_name, gp_name) for dr_name, gp_name in sorted(mappings.items())]
-        insert_rows_zebra(dialog_design.tree, rows, clear_existing=True)
+    def refresh_table(focus_key: str | None = None) -> None:
+        """Clear and repopulate the table, keeping focus on the given Deliveroo name."""
+        rows = sorted(mappings.items())
+        item_ids = insert_rows_zebra(dialog_design.tree, rows, clear_existing=True)
         dialog_design.update_count(len(mappings))
 
+        if focus_key is not None:
+            iid_by_name = {row[0]: iid for row, iid in zip(rows, item_ids)}
+            if focus_key in iid_by_name:
+                focus_row(dialog_design.tree, iid_by_name[focus_key])
+
     # ------------------------------------------------------------------------------------------------
     # BUTTON HANDLERS
     # ------------------------------------------------------------------------------------------------
@@ -158,7 +164,7 @@ def show_mfc_mappings_dialog(
 
             mappings[dr_name] = gp_name
             if save_mfc_mapping(reference_folder, mappings):
-                refresh_table()
+                refresh_table(focus_key=dr_name)
                 log(f"MFC Mapping added: {dr_name} → {gp_name}")
                 entry_design.destroy()
             else:
@@ -199,7 +205,7 @@ def show_mfc_mappings_dialog(
             mappings[new_dr_name] = new_gp_name
 
             if save_mfc_mapping(reference_folder, mappings):
-                refresh_table()
+                refresh_table(focus_key=new_dr_name)
                 log(f"MFC Mapping updated: {new_dr_name} → {new_gp_name}")
                 entry_design.destroy()
             else:
@@ -276,24 +282,55 @@ def show_unmapped_mfc_dialog(
     mappings = load_mfc_mapping(reference_folder)
 
     # Track pending mappings (initially all unmapped have empty GoPuff name)
-    pending_mappings: Dict[str, str] = {name: "" for name in unmapped}
+    pending_mappings: Dict[str, str] = dict.fromkeys(unmapped, "")
+
+    # Names are fixed for the dialog's lifetime, so sort once
+    sorted_names = sorted(pending_mappings)
 
     # Create dialog design
     dialog_design = UnmappedMfcDialog()
     dialog_design.build(parent, unmapped_count=len(unmapped))
 
+    # Single GoPuff name input dialog, reused for every row (destroyed with the parent)
+    input_design = SetGopuffNameDialog()
+
     # ------------------------------------------------------------------------------------------------
     # HELPER FUNCTIONS
     # ------------------------------------------------------------------------------------------------
 
+    # Row lookup and unmapped counter, maintained incrementally after the initial load
+    iid_by_name: Dict[str, str] = {}
+    remaining = [0]
+    dirty = [False]
+
     def refresh_table() -> None:
-        """Clear and repopulate the table with zebra striping."""
-        rows = [(dr_name, gp_name or "(not set)") for dr_name, gp_name in sorted(pending_mappings.items())]
-        insert_rows_zebra(dialog_design.tree, rows, clear_existing=True)
+        """Clear and repopulate the table with zebra striping (initial load)."""
+        rows = [(dr_name, pending_mappings[dr_name] or "(not set)") for dr_name in sorted_names]
+        item_ids = insert_rows_zebra(dialog_design.tree, rows, clear_existing=True)
+
+        iid_by_name.clear()
+        iid_by_name.update(zip(sorted_names, item_ids))
 
         # Count how many are still unmapped
-        remaining = sum(1 for v in pending_mappings.values() if not v)
-        dialog_design.update_status(remaining)
+        remaining[0] = sum(1 for v in pending_mappings.values() if not v)
+        dialog_design.update_status(remaining[0])
+
+    def update_row(dr_name: str, gp_name: str) -> None:
+        """Update a single row in place and adjust the remaining count."""
+        previous = pending_mappings[dr_name]
+        if gp_name == previous:
+            return
+        was_unset = not previous
+        pending_mappings[dr_name] = gp_name
+        dirty[0] = True
+
+        iid = iid_by_name[dr_name]
+        dialog_design.tree.item(iid, values=(dr_name, gp_name))
+        focus_row(dialog_design.tree, iid)
+
+        if was_unset:
+            remaining[0] -= 1
+            dialog_design.update_status(remaining[0])
 
     # ------------------------------------------------------------------------------------------------
     # BUTTON HANDLERS
@@ -301,18 +338,26 @@ def show_unmapped_mfc_dialog(
 
     def on_set_name() -> None:
         """Open dialog to set GoPuff name for selected row."""
-        selected = get_selected_values(dialog_design.tree)
-        if not selected:
+        tree = dialog_design.tree
+        selection = tree.selection()
+        if not selection:
             show_warning("Please select a row to map.", title="Selection", parent=dialog_design.dialog)
             return
 
-        dr_name = selected[0][0]
+        # Read only the Deliveroo name cell of the selected row
+        dr_name = tree.set(selection[0], tree["columns"][0])
         current_gp = pending_mappings.get(dr_name, "")
         if current_gp == "(not set)":
             current_gp = ""
 
-        input_design = SetGopuffNameDialog()
-        input_design.build(dialog_design.dialog, deliveroo_name=dr_name, initial_value=current_gp)
+        # Build the input dialog on first use; afterwards reuse the hidden instance
+        if input_design.dialog is None:
+            input_design.build(dialog_design.dialog, deliveroo_name=dr_name, initial_value=current_gp)
+            input_design.cancel_btn.configure(command=input_design.hide)
+            input_design.dialog.protocol("WM_DELETE_WINDOW", input_design.hide)
+        else:
+            input_design.reconfigure(deliveroo_name=dr_name, initial_value=current_gp)
+            input_design.show()
 
         def do_save() -> None:
             gp_name = input_design.get_value()
@@ -320,26 +365,45 @@ def show_unmapped_mfc_dialog(
                 show_warning("GoPuff name is required.", title="Validation", parent=input_design.dialog)
                 return
 
-            pending_mappings[dr_name] = gp_name
-            refresh_table()
-            input_design.destroy()
+            update_row(dr_name, gp_name)
+            input_design.hide()
 
-        # Wire input dialog
+        # Rewire per row (do_save captures dr_name)
         input_design.save_btn.configure(command=do_save)
-        input_design.cancel_btn.configure(command=input_design.destroy)
         input_design.gp_entry.bind("<Return>", lambda e: do_save())
 
     def on_continue() -> None:
         """Save all mappings and close dialog."""
+        if not dirty[0]:
+            # Nothing changed - close without rewriting the mapping file
+            dialog_design.set_completed(True)
+            dialog_design.destroy()
+            return
+
         for dr_name, gp_name in pending_mappings.items():
             if gp_name:
                 mappings[dr_name] = gp_name
 
-        if save_mfc_mapping(reference_folder, mappings):
-            dialog_design.set_completed(True)
-            dialog_design.destroy()
-        else:
-            show_error("Failed to save mappings.", title="Error", parent=dialog_design.dialog)
+        # Write on a worker thread (slow on synced drives) and poll for completion
+        dialog_design.set_saving(True)
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(save_mfc_mapping, reference_folder, dict(mappings))
+        executor.shutdown(wait=False)
+
+        def check_save() -> None:
+            if not future.done():
+                dialog_design.dialog.after(50, check_save)
+                return
+
+            dialog_design.set_saving(False)
+            if future.result():
+                dialog_design.set_completed(True)
+                dialog_design.destroy()
+            else:
+                dialog_design.update_status(remaining[0])
+                show_error("Failed to save mappings.", title="Error", parent=dialog_design.dialog)
+
+        dialog_design.dialog.after(50, check_save)
 
     def on_cancel() -> None:
         """Cancel without saving."""
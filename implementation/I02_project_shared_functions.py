@@ -393,6 +393,51 @@ def calculate_accrual_period(
 # 6. MFC MAPPING FUNCTIONS (DELIVEROO)
 # ====================================================================================================
 
+@lru_cache(maxsize=8)
+def _read_mfc_mapping_cached(csv_path: Path, mtime_ns: int) -> Tuple[Tuple[str, str], ...]:
+    """
+    Description:
+        Parse the MFC mapping CSV into an immutable tuple of (deliveroo, gopuff) pairs.
+
+    Args:
+        csv_path (Path): Full path to mfc_names.csv.
+        mtime_ns (int): File modification time; part of the cache key so edits are picked up.
+
+    Returns:
+        Tuple[Tuple[str, str], ...]: Mapping pairs (empty if file has no usable rows).
+
+    Raises:
+        Exception: Any read error propagates (and is therefore not cached).
+
+    Notes:
+        - Private helper for load_mfc_mapping(); callers receive a fresh dict copy.
+    """
+    # Names are text - skip per-column type inference
+    df = read_csv_file(csv_path, dtype=str)
+
+    if df.empty:
+        logger.info("MFC mapping file is empty: %s", csv_path)
+        return ()
+
+    # Check for expected column names, or fall back to first two columns
+    if 'deliveroo_name' in df.columns and 'gopuff_name' in df.columns:
+        col_dr = 'deliveroo_name'
+        col_gp = 'gopuff_name'
+    elif len(df.columns) >= 2:
+        # Use first two columns regardless of names
+        col_dr = df.columns[0]
+        col_gp = df.columns[1]
+        logger.info("MFC mapping using columns: '%s' → '%s'", col_dr, col_gp)
+    else:
+        logger.warning("MFC mapping CSV must have at least 2 columns")
+        return ()
+
+    pairs = tuple(dict(zip(df[col_dr].astype(str), df[col_gp].astype(str))).items())
+    logger.info("Loaded %d MFC mappings from: %s", len(pairs), csv_path.name)
+
+    return pairs
+
+
 def load_mfc_mapping(reference_folder: Path) -> Dict[str, str]:
     """
     Description:
@@ -410,6 +455,7 @@ def load_mfc_mapping(reference_folder: Path) -> Dict[str, str]:
     Notes:
         - CSV must have columns: deliveroo_name, gopuff_name
         - Returns empty dict if file doesn't exist or is empty.
+        - Parsed result is cached on (path, mtime); each call returns a new dict.
     """
     from implementation.I03_project_static_lists import DR_MFC_MAPPING_FILENAME
 
@@ -420,30 +466,7 @@ def load_mfc_mapping(reference_folder: Path) -> Dict[str, str]:
         return {}
 
     try:
-        df = read_csv_file(csv_path)
-
-        if df.empty:
-            logger.info("MFC mapping file is empty: %s", csv_path)
-            return {}
-
-        # Check for expected column names, or fall back to first two columns
-        if 'deliveroo_name' in df.columns and 'gopuff_name' in df.columns:
-            col_dr = 'deliveroo_name'
-            col_gp = 'gopuff_name'
-        elif len(df.columns) >= 2:
-            # Use first two columns regardless of names
-            col_dr = df.columns[0]
-            col_gp = df.columns[1]
-            logger.info("MFC mapping using columns: '%s' → '%s'", col_dr, col_gp)
-        else:
-            logger.warning("MFC mapping CSV must have at least 2 columns")
-            return {}
-
-        # Build mapping dict
-        mapping = dict(zip(df[col_dr].astype(str), df[col_gp].astype(str)))
-        logger.info("Loaded %d MFC mappings from: %s", len(mapping), csv_path.name)
-
-        return mapping
+        return dict(_read_mfc_mapping_cached(csv_path, csv_path.stat().st_mtime_ns))
 
     except Exception as exc:
         logger.error("Failed to load MFC mapping: %s", exc)
@@ -468,6 +491,7 @@ def save_mfc_mapping(reference_folder: Path, mapping: Dict[str, str]) -> bool:
     Notes:
         - Creates file if it doesn't exist.
         - Overwrites existing file.
+        - Invalidates the load_mfc_mapping() cache.
     """
     from implementation.I03_project_static_lists import DR_MFC_MAPPING_FILENAME
 
@@ -482,6 +506,7 @@ def save_mfc_mapping(reference_folder: Path, mapping: Dict[str, str]) -> bool:
 
         # Save using core utility
         save_dataframe(df, csv_path, backup_existing=False)
+        _read_mfc_mapping_cached.cache_clear()
         logger.info("Saved %d MFC mappings to: %s", len(mapping), csv_path.name)
 
         return True
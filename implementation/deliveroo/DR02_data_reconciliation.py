@@ -103,12 +103,59 @@ from core.C09_io_utils import read_csv_file, save_dataframe
 from core.C12_data_processing import standardise_columns, convert_to_datetime
 
 from implementation.I02_project_shared_functions import calculate_accrual_period
+from implementation.I03_project_static_lists import DELIVEROO_RECON_COLUMN_ORDER
 
 
 # ====================================================================================================
 # 3. DWH LOADING (DELIVEROO ONLY)
 # ====================================================================================================
 
+# DWH columns read from disk: those used for filtering/matching plus every dwh_* column in the
+# Deliveroo reconciliation output layout. Other export columns are skipped at parse time.
+REQUIRED_DWH_COLS: frozenset[str] = frozenset(
+    {
+        "order_vendor", "gp_order_id", "mp_order_id", "location_name", "order_completed",
+        "created_at_day", "created_at_timestamp", "delivered_at_timestamp",
+        "total_payment_with_tips_inc_vat", "total_payment_inc_vat", "post_promo_sales_inc_vat",
+        "delivery_fee_inc_vat", "priority_fee_inc_vat", "small_order_fee_inc_vat",
+        "mp_bag_fee_inc_vat", "tips_amount",
+    }
+    | {col[len("dwh_"):] for col in DELIVEROO_RECON_COLUMN_ORDER if col.startswith("dwh_")}
+)
+
+
+# ID cleanup patterns, equivalent to strip + drop trailing ".0" + the per-column rule.
+# _ORDER_LAST4_RE expects already-stripped input: the last 4 characters may include internal whitespace.
+_MP_ORDER_ID_CLEAN_RE = re.compile(r"\.0\s*$|\D")                          # -> digits only
+_ORDER_LAST4_RE = re.compile(r"0*(?!\.0$)([\s\S]{1,4}?)(?:\.0)?$")          # -> last 4, no leading 0s
+
+
+# Expected layout of DWH and Deliveroo timestamp strings (e.g. "2025-10-27 00:09:20")
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _is_required_dwh_col(col: str) -> bool:
+    """Return True if a raw DWH header (pre-standardisation) is in REQUIRED_DWH_COLS."""
+    return str(col).strip().lower().replace(" ", "_") in REQUIRED_DWH_COLS
+
+
+def _parse_timestamps(values: pd.Series) -> pd.Series:
+    """
+    Parse timestamps with the TS_FMT fast path, falling back to inference only for misses.
+
+    Fallback values carrying an offset (+00:00, Z) are converted to UTC and made naive, so the
+    result is always naive datetime64[ns] even when naive and offset strings are mixed.
+    """
+    parsed = pd.to_datetime(values, format=TS_FMT, errors="coerce", cache=True)
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        fallback = pd.to_datetime(values.loc[retry], utc=True, errors="coerce", cache=True)
+        parsed.loc[retry] = fallback.dt.tz_localize(None)
+    if parsed.dtype != "datetime64[ns]":
+        raise TypeError(f"Timestamp parsing produced {parsed.dtype}, expected datetime64[ns]")
+    return parsed
+
+
 def load_dwh_deliveroo(
     dwh_folder: Path,
     start_date: date,
@@ -142,39 +189,59 @@ def load_dwh_deliveroo(
     if not csv_files:
         raise FileNotFoundError(f"No DWH CSV files found in {dwh_folder}")
 
-    dfs = []
-    for csv_file in csv_files:
+    # Read each file, standardise and filter to Deliveroo orders before concatenating,
+    # so other vendors' rows are never held in the combined frame
+    def read_one(csv_file: Path) -> Tuple[pd.DataFrame, int, bool] | None:
+        """Return (filtered_df, raw_row_count, was_filtered), or None if the file is unreadable."""
         try:
-            df = read_csv_file(csv_file, dtype=str, low_memory=False)
-            dfs.append(df)
-            logger.debug(f"Loaded: {csv_file.name} ({len(df):,} rows)")
+            df = read_csv_file(csv_file, dtype=str, usecols=_is_required_dwh_col, low_memory=False)
+            df = standardise_columns(df)
+            raw_rows = len(df)
+            logger.debug(f"Loaded: {csv_file.name} ({raw_rows:,} rows)")
+
+            if "order_vendor" not in df.columns:
+                return df, raw_rows, False
+            # Compare the few distinct vendor labels case-insensitively, not every row's string
+            vendor = df["order_vendor"].astype("category")
+            deliveroo_labels = [c for c in vendor.cat.categories if str(c).lower() == "deliveroo"]
+            return df.loc[vendor.isin(deliveroo_labels)], raw_rows, True
         except Exception as e:
             logger.warning(f"Skipped {csv_file.name}: {e}")
+            return None
+
+    # The C parser releases the GIL, so files parse concurrently; map() keeps file order
+    with ThreadPoolExecutor(max_workers=min(8, len(csv_files))) as executor:
+        results = [res for res in executor.map(read_one, csv_files) if res is not None]
+
+    dfs = [df for df, _, _ in results]
+    total_rows = sum(raw_rows for _, raw_rows, _ in results)
+    has_unfiltered = not all(was_filtered for _, _, was_filtered in results)
 
     if not dfs:
         raise FileNotFoundError(f"No valid DWH CSV files in {dwh_folder}")
 
     combined = pd.concat(dfs, ignore_index=True)
-    log(f"Loaded {len(csv_files)} DWH file(s) -> {len(combined):,} total rows")
+    del dfs, results  # Release per-file frames so only the combined copy stays alive
+    log(f"Loaded {len(csv_files)} DWH file(s) -> {total_rows:,} total rows")
 
-    # Standardise column names
-    combined = standardise_columns(combined)
-
-    # Filter to Deliveroo orders only
+    # Filter to Deliveroo orders only (already applied per file; concat returns a fresh frame)
     if "order_vendor" in combined.columns:
-        combined = combined[combined["order_vendor"].str.lower() == "deliveroo"].copy()
+        if has_unfiltered:
+            # Rows from files without order_vendor cannot be Deliveroo once the column exists
+            combined = combined.loc[combined["order_vendor"].notna()].reset_index(drop=True)
         log(f"Filtered to Deliveroo: {len(combined):,} rows")
     else:
         log("Warning: No order_vendor column found - using all rows")
 
+    # Low-cardinality text columns -> category (dictionary-encoded, far smaller than object)
+    for col in ("order_vendor", "location_name", "mfc_name"):
+        if col in combined.columns:
+            combined[col] = combined[col].astype("category")
+
     # Clean mp_order_id (this is the last 4 digits we match against)
     if "mp_order_id" in combined.columns:
         combined["mp_order_id"] = (
-            combined["mp_order_id"]
-            .astype(str)
-            .str.strip()
-            .str.replace(r"\.0$", "", regex=True)
-            .str.replace(r"[^0-9]", "", regex=True)
+            combined["mp_order_id"].astype(str).str.replace(_MP_ORDER_ID_CLEAN_RE, "", regex=True)
         )
 
     # Convert numeric columns
@@ -189,9 +256,9 @@ def load_dwh_deliveroo(
         "mp_bag_fee_inc_vat",
         "tips_amount",
     ]
-    for col in numeric_cols:
-        if col in combined.columns:
-            combined[col] = pd.to_numeric(combined[col], errors="coerce").fillna(0.0)
+    present_cols = [col for col in numeric_cols if col in combined.columns]
+    if present_cols:
+        combined[present_cols] = combined[present_cols].apply(pd.to_numeric, errors="coerce").fillna(0.0)
 
     # Convert date columns
     if "created_at_day" in combined.columns:
@@ -200,9 +267,9 @@ def load_dwh_deliveroo(
 
     # Parse timestamp columns for collision resolution
     if "created_at_timestamp" in combined.columns:
-        combined["created_at_ts"] = pd.to_datetime(combined["created_at_timestamp"], errors="coerce")
+        combined["created_at_ts"] = _parse_timestamps(combined["created_at_timestamp"])
     if "delivered_at_timestamp" in combined.columns:
-        combined["delivered_at_ts"] = pd.to_datetime(combined["delivered_at_timestamp"], errors="coerce")
+        combined["delivered_at_ts"] = _parse_timestamps(combined["delivered_at_timestamp"])
 
     return combined
 
@@ -211,6 +278,25 @@ def load_dwh_deliveroo(
 # 4. DELIVEROO COMBINED CSV LOADING
 # ====================================================================================================
 
+@lru_cache(maxsize=4)
+def _read_dr_combined_cached(dr_file: Path, mtime_ns: int) -> pd.DataFrame:
+    """
+    Description:
+        Parse a Deliveroo Combined CSV, memoised on (path, modification time).
+
+    Args:
+        dr_file (Path): Resolved path to the Deliveroo Combined CSV.
+        mtime_ns (int): File modification time; a DR001 re-run changes it and forces a re-read.
+
+    Returns:
+        pd.DataFrame: Raw parsed data. Shared cache entry - callers must copy before mutating.
+
+    Raises:
+        Exception: Any read error propagates (and is therefore not cached).
+    """
+    return read_csv_file(dr_file, low_memory=False)
+
+
 def load_dr_combined(
     output_folder: Path,
     stmt_start: date,
@@ -262,18 +348,23 @@ def load_dr_combined(
                 f"Please run Step 1 (Parse CSVs) first."
             )
 
-    dr_df = read_csv_file(dr_file, low_memory=False)
+    dr_file = dr_file.resolve()
+    dr_df = _read_dr_combined_cached(dr_file, dr_file.stat().st_mtime_ns).copy()
     log(f"Loaded Deliveroo data: {dr_file.name} -> {len(dr_df):,} rows")
 
+    # Low-cardinality text column -> category
+    if "mfc_name" in dr_df.columns:
+        dr_df["mfc_name"] = dr_df["mfc_name"].astype("category")
+
     # Ensure numeric columns (including marketing_offer_discount for variance calculation)
     numeric_cols = [
         "order_value_gross", "commission_net", "commission_vat",
         "adjustment_net", "adjustment_vat", "total_payable",
         "marketing_offer_discount",
     ]
-    for col in numeric_cols:
-        if col in dr_df.columns:
-            dr_df[col] = pd.to_numeric(dr_df[col], errors="coerce").fillna(0)
+    present_cols = [col for col in numeric_cols if col in dr_df.columns]
+    if present_cols:
+        dr_df[present_cols] = dr_df[present_cols].apply(pd.to_numeric, errors="coerce").fillna(0)
 
     # Calculate gross totals (net + vat) for easier reconciliation
     if "commission_net" in dr_df.columns and "commission_vat" in dr_df.columns:
@@ -285,25 +376,24 @@ def load_dr_combined(
     # Extract last 4 digits of order_number for matching
     # Strip leading zeros to match DWH format (e.g., "0660" -> "660")
     if "order_number" in dr_df.columns:
-        dr_df["order_last4"] = (
-            dr_df["order_number"]
+        # One regex pass per distinct order_number (orders repeat across adjustment rows):
+        # last 4 characters with leading zeros stripped; "0000" -> "0"
+        codes, uniques = pd.factorize(dr_df["order_number"], use_na_sentinel=False)
+        last4 = (
+            pd.Series(uniques)
             .astype(str)
             .str.strip()
-            .str.replace(r"\.0$", "", regex=True)
-            .str[-4:]  # Last 4 digits
-            .str.lstrip("0")  # Strip leading zeros to match DWH format
+            .str.extract(_ORDER_LAST4_RE, expand=False)
+            .fillna("0")
+            .to_numpy()
         )
-        # Handle edge case where order ends in "0000" -> becomes empty string
-        dr_df.loc[dr_df["order_last4"] == "", "order_last4"] = "0"
+        dr_df["order_last4"] = last4.take(codes)
         log(f"Extracted last 4 digits from order_number (leading zeros stripped)")
 
     # Convert delivery_datetime_utc to date and timestamp for matching
     # Format is already string datetime like "2025-10-27 00:09:20"
     if "delivery_datetime_utc" in dr_df.columns:
-        dr_df["dr_delivery_ts"] = pd.to_datetime(
-            dr_df["delivery_datetime_utc"],
-            errors='coerce'
-        )
+        dr_df["dr_delivery_ts"] = _parse_timestamps(dr_df["delivery_datetime_utc"])
         dr_df["delivery_date"] = dr_df["dr_delivery_ts"].dt.date
 
     return dr_df
@@ -313,6 +403,90 @@ def load_dr_combined(
 # 5. ORDER AGGREGATION (GROUP ORDERS WITH ADJUSTMENTS)
 # ====================================================================================================
 
+def _aggregate_orders(dr_df: pd.DataFrame, is_order: np.ndarray, is_fee: np.ndarray) -> pd.DataFrame:
+    """
+    Description:
+        Aggregation behind aggregate_order_values, using row-type masks computed by the
+        caller so match_deliveroo_orders can share the masks it already has.
+
+    Args:
+        dr_df (pd.DataFrame): Deliveroo Combined data with all row types.
+        is_order (np.ndarray): Boolean mask of "Order Value & Commission" rows.
+        is_fee (np.ndarray): Boolean mask of "Additional Fees" rows.
+
+    Returns:
+        pd.DataFrame: See aggregate_order_values.
+    """
+    if not is_order.any():
+        return pd.DataFrame()
+
+    def numeric_values(col: str) -> np.ndarray:
+        """Return a column as float64 (non-numeric -> 0, missing column -> all 0)."""
+        if col not in dr_df.columns:
+            return np.zeros(len(dr_df))
+        return pd.to_numeric(dr_df[col], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    # Order values are NOT summed across duplicate order rows: like the row-by-row version, an
+    # order carries the values of its last order row in (stable) delivery_date order. value_rank
+    # is each order row's position in that order (-1 = not an order row).
+    n_rows = len(dr_df)
+    order_rows = np.flatnonzero(is_order)
+    if "delivery_date" in dr_df.columns:
+        date_order = pd.Series(dr_df["delivery_date"].to_numpy()[order_rows]).sort_values(kind="stable")
+        order_rows = order_rows[date_order.index.to_numpy()]
+    value_rank = np.full(n_rows, -1)
+    value_rank[order_rows] = np.arange(len(order_rows))
+
+    # Mask every value to its row type so a single groupby pass produces all aggregates
+    work = pd.DataFrame({
+        "order_number": dr_df["order_number"].to_numpy(),
+        # Additional Fees adjustments are typically refunds for unavailable items (negative values)
+        "unavailable_items_adjustment": np.where(is_fee, numeric_values("adjustment_gross"), 0.0),
+        "is_fee": is_fee,
+        "order_pos": np.where(is_order, np.arange(n_rows), n_rows),   # n_rows = not an order row
+        "value_rank": value_rank,
+    })
+
+    agg_df = work.groupby("order_number", sort=False, dropna=False).agg(
+        unavailable_items_adjustment=("unavailable_items_adjustment", "sum"),
+        fees_row_count=("is_fee", "sum"),
+        order_row_count=("is_fee", "size"),   # Total rows per order_number (orders + adjustments)
+        order_pos=("order_pos", "min"),
+        value_rank=("value_rank", "max"),
+    )
+
+    # Keep order_numbers that have an order row (adjustment-only numbers are standalone),
+    # in order-row order, and take the matching keys from that first order row
+    agg_df = agg_df[agg_df["order_pos"] < n_rows].sort_values("order_pos").reset_index()
+    key_cols = [
+        col for col in ("order_last4", "mfc_name", "delivery_date", "dr_delivery_ts")
+        if col in dr_df.columns
+    ]
+    order_pos = agg_df.pop("order_pos").to_numpy()
+    for col in key_cols:
+        agg_df[col] = dr_df[col].array.take(order_pos)
+    value_pos = order_rows[agg_df.pop("value_rank").to_numpy()]
+    agg_df["order_value_gross"] = numeric_values("order_value_gross")[value_pos]
+    agg_df["marketing_offer_discount"] = numeric_values("marketing_offer_discount")[value_pos]
+
+    agg_df["fees_row_count"] = agg_df["fees_row_count"].astype(int)
+
+    # Calculate gross_order_value and net_sales_value (what we compare to DWH)
+    # DWH records the net fulfilled value, so we need: gross - refunds
+    agg_df["gross_order_value"] = agg_df["order_value_gross"] + agg_df["marketing_offer_discount"]
+    agg_df["net_sales_value"] = agg_df["gross_order_value"] + agg_df["unavailable_items_adjustment"]
+
+    # Flag orders with refunds
+    agg_df["has_refund"] = agg_df["unavailable_items_adjustment"] != 0
+
+    return agg_df[[
+        "order_number", *key_cols,
+        "gross_order_value", "order_value_gross", "marketing_offer_discount",
+        "unavailable_items_adjustment", "fees_row_count", "order_row_count",
+        "net_sales_value", "has_refund",
+    ]]
+
+
 def aggregate_order_values(dr_df: pd.DataFrame) -> pd.DataFrame:
     """
     Description:
@@ -326,6 +500,11 @@ def aggregate_order_values(dr_df: pd.DataFrame) -> pd.DataFrame:
         Note: "Additional Payments" (commission refunds) do NOT affect sales value reconciliation.
         They represent commission adjustments, not changes to the customer order value.
 
+        All values come from one groupby pass over row-type-masked columns. Matching keys
+        (order_last4, mfc_name, delivery_date, dr_delivery_ts) are taken from the first order row;
+        if an order_number has several order rows, its values come from the last one by
+        delivery_date (they are not summed).
+
     Args:
         dr_df (pd.DataFrame): Deliveroo Combined data with all row types.
 
@@ -335,159 +514,262 @@ def aggregate_order_values(dr_df: pd.DataFrame) -> pd.DataFrame:
             - order_last4 (for matching)
             - mfc_name (for matching)
             - delivery_date (for matching)
+            - dr_delivery_ts (for collision resolution, if present)
             - gross_order_value
             - unavailable_items_adjustment
             - net_sales_value (this is what we compare to DWH)
             - order_row_count (how many DR rows for this order)
             - has_refund (boolean - True if any Additional Fees rows exist)
     """
-    # Separate order types
-    orders_df = dr_df[dr_df["accounting_category"] == "Order Value & Commission"].copy()
-    fees_df = dr_df[dr_df["accounting_category"] == "Additional Fees"].copy()
-
-    if orders_df.empty:
-        return pd.DataFrame()
+    # Row-type masks: order values come from order rows, adjustments from Additional Fees rows
+    category = dr_df["accounting_category"].to_numpy()
+    return _aggregate_orders(
+        dr_df, category == "Order Value & Commission", category == "Additional Fees"
+    )
 
-    # Calculate gross_order_value for each order
-    orders_df["marketing_offer_discount"] = pd.to_numeric(
-        orders_df.get("marketing_offer_discount", 0), errors="coerce"
-    ).fillna(0)
-    orders_df["order_value_gross"] = pd.to_numeric(
-        orders_df["order_value_gross"], errors="coerce"
-    ).fillna(0)
-    orders_df["gross_order_value"] = orders_df["order_value_gross"] + orders_df["marketing_offer_discount"]
-
-    # Aggregate Additional Fees adjustments by order_number
-    # These are typically refunds for unavailable items (negative values)
-    if not fees_df.empty:
-        fees_df["adjustment_gross"] = pd.to_numeric(
-            fees_df.get("adjustment_gross", 0), errors="coerce"
-        ).fillna(0)
-
-        fees_agg = fees_df.groupby("order_number").agg(
-            unavailable_items_adjustment=("adjustment_gross", "sum"),
-            fees_row_count=("order_number", "count"),
-        ).reset_index()
-    else:
-        fees_agg = pd.DataFrame(columns=["order_number", "unavailable_items_adjustment", "fees_row_count"])
-        fees_agg["unavailable_items_adjustment"] = 0
-        fees_agg["fees_row_count"] = 0
 
-    # Count total rows per order_number (orders + adjustments)
-    row_counts = dr_df.groupby("order_number").size().reset_index(name="order_row_count")
-
-    # Build aggregated result from orders
-    agg_df = orders_df[[
-        "order_number", "order_last4", "mfc_name", "delivery_date",
-        "gross_order_value", "order_value_gross", "marketing_offer_discount"
-    ]].copy()
-
-    # Merge in adjustments
-    agg_df = agg_df.merge(fees_agg, on="order_number", how="left")
-    agg_df["unavailable_items_adjustment"] = agg_df["unavailable_items_adjustment"].fillna(0)
-    agg_df["fees_row_count"] = agg_df["fees_row_count"].fillna(0).astype(int)
+# ====================================================================================================
+# 6. MATCHING LOGIC
+# ====================================================================================================
 
-    # Merge row counts
-    agg_df = agg_df.merge(row_counts, on="order_number", how="left")
+# Timestamps are compared as int64 nanoseconds; NaT is stored as the int64 minimum
+NAT_NS: int = np.iinfo(np.int64).min
+COLLISION_BUFFER_NS: int = 1 * 3_600_000_000_000   # 1 hour after DWH delivered_at_timestamp
 
-    # Calculate net_sales_value (what we compare to DWH)
-    # DWH records the net fulfilled value, so we need: gross - refunds
-    agg_df["net_sales_value"] = agg_df["gross_order_value"] + agg_df["unavailable_items_adjustment"]
 
-    # Flag orders with refunds
-    agg_df["has_refund"] = agg_df["unavailable_items_adjustment"] != 0
+def _to_ns(values: np.ndarray) -> np.ndarray:
+    """Convert datetime64 values to int64 nanoseconds (NaT -> NAT_NS)."""
+    return np.asarray(values, dtype="datetime64[ns]").view(np.int64)
 
-    return agg_df
 
+def _to_days(values: np.ndarray) -> np.ndarray:
+    """Convert date objects to int64 days since epoch (NaT/None -> NAT_NS)."""
+    days = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce").to_numpy()
+    return days.astype("datetime64[D]").view(np.int64)
 
-# ====================================================================================================
-# 6. MATCHING LOGIC
-# ====================================================================================================
 
 def _resolve_collision_by_timestamp(
-    dr_delivery_ts: Any,
-    candidates: List[Dict],
-    buffer_hours: int = 1,
-) -> Tuple[Dict | None, str]:
+    dr_delivery_ns: int,
+    window_start_ns: np.ndarray,
+    window_end_ns: np.ndarray,
+) -> Tuple[int, str]:
     """
     Resolve collision using timestamp window.
 
     DR delivery_datetime_utc must fall between:
       - DWH created_at_timestamp
-      - DWH delivered_at_timestamp + buffer
+      - DWH delivered_at_timestamp + buffer (COLLISION_BUFFER_NS, applied at lookup build)
+
+    Candidates missing either DWH timestamp are given an empty window at lookup build,
+    so no per-candidate NaT check is needed here.
 
     Args:
-        dr_delivery_ts: Deliveroo delivery timestamp.
-        candidates: List of DWH candidate dicts with timestamps.
-        buffer_hours: Buffer after delivered_at_timestamp.
+        dr_delivery_ns: Deliveroo delivery timestamp in int64 ns (NAT_NS if missing).
+        window_start_ns: Candidates' window start (DWH created_at) in int64 ns.
+        window_end_ns: Candidates' window end (DWH delivered_at + buffer) in int64 ns.
 
     Returns:
-        tuple: (matched_candidate, match_type) or (None, reason)
+        tuple: (candidate_index, match_type) or (-1, reason)
     """
-    if pd.isna(dr_delivery_ts):
-        return None, "NO_DR_TIMESTAMP"
-
-    matching_candidates = []
-
-    for cand in candidates:
-        created_ts = cand.get("created_at_ts")
-        delivered_ts = cand.get("delivered_at_ts")
+    if dr_delivery_ns == NAT_NS:
+        return -1, "NO_DR_TIMESTAMP"
 
-        if pd.isna(created_ts) or pd.isna(delivered_ts):
-            continue
+    # Window: created_at to delivered_at + buffer
+    hits = np.flatnonzero((window_start_ns <= dr_delivery_ns) & (dr_delivery_ns <= window_end_ns))
 
-        # Window: created_at to delivered_at + buffer
-        window_end = delivered_ts + timedelta(hours=buffer_hours)
-
-        if created_ts <= dr_delivery_ts <= window_end:
-            matching_candidates.append(cand)
-
-    if len(matching_candidates) == 1:
-        return matching_candidates[0], "MATCHED_BY_TIMESTAMP"
-    elif len(matching_candidates) > 1:
-        return None, "MULTIPLE_TIMESTAMP_MATCHES"
+    if len(hits) == 1:
+        return int(hits[0]), "MATCHED_BY_TIMESTAMP"
+    elif len(hits) > 1:
+        return -1, "MULTIPLE_TIMESTAMP_MATCHES"
     else:
-        return None, "NO_TIMESTAMP_MATCH"
+        return -1, "NO_TIMESTAMP_MATCH"
 
 
 def _resolve_collision_by_value(
     dr_value: float,
-    candidates: List[Dict],
+    dwh_values: np.ndarray,
     tolerance: float = 0.10,
-) -> Tuple[Dict | None, str]:
+) -> Tuple[int, str]:
     """
     Resolve collision by matching closest value.
     Used as fallback when timestamp resolution fails.
 
     Args:
         dr_value: Deliveroo net_sales_value.
-        candidates: List of DWH candidate dicts with dwh_value.
+        dwh_values: Candidates' DWH post_promo_sales_inc_vat (float64 array).
         tolerance: Maximum absolute difference for match (default £0.10).
 
     Returns:
-        tuple: (matched_candidate, match_type) or (None, reason)
+        tuple: (candidate_index, match_type) or (-1, reason)
     """
     if pd.isna(dr_value):
-        return None, "NO_DR_VALUE"
-
-    best_match = None
-    best_diff = float("inf")
-
-    for cand in candidates:
-        dwh_value = cand.get("dwh_value", 0) or 0
-        diff = abs(dwh_value - dr_value)
+        return -1, "NO_DR_VALUE"
 
-        if diff < best_diff:
-            best_diff = diff
-            best_match = cand
+    # Closest value wins (first candidate on ties); a missing DWH value is never closest
+    diffs = np.abs(dwh_values - dr_value)
+    diffs[np.isnan(diffs)] = np.inf
+    best = int(np.argmin(diffs))
+    best_diff = diffs[best]
 
-    if best_match:
-        dwh_value = best_match.get("dwh_value", 0) or 0
+    if best_diff < np.inf:
+        dwh_value = dwh_values[best]
         # Check if it's a good match (within tolerance or 1% of value)
         if best_diff < tolerance or (dwh_value > 0 and best_diff / dwh_value < 0.01):
-            return best_match, "MATCHED_BY_VALUE"
+            return best, "MATCHED_BY_VALUE"
+
+    return -1, "NO_VALUE_MATCH"
+
+
+# Per-order match status codes produced by _match_orders; each indexes the label arrays below
+_NO_DWH_RECORD, _MATCHED, _MATCHED_CROSS_MIDNIGHT, _MATCHED_BY_TIMESTAMP, _MATCHED_BY_VALUE, _COLLISION = range(6)
+_MATCH_STATUS_LABELS = np.array([
+    "NO_DWH_RECORD", "MATCHED", "MATCHED_CROSS_MIDNIGHT",
+    "MATCHED_BY_TIMESTAMP", "MATCHED_BY_VALUE", "COLLISION",
+], dtype=object)
+_MATCH_CONFIDENCE_LABELS = np.array([
+    "N/A", "High", "High (Cross-Midnight)",
+    "Medium (Timestamp)", "Low (Value)", "Ambiguous",
+], dtype=object)
+
+
+def _uncontested_orders(
+    order_bucket: np.ndarray,
+    order_prev_bucket: np.ndarray,
+    bucket_offsets: np.ndarray,
+    slot_gp: np.ndarray,
+    n_gp_codes: int,
+) -> np.ndarray:
+    """
+    Description:
+        Flag orders whose match cannot depend on processing order: the same-day bucket
+        holds one candidate, no other order looks at that bucket (same-day or
+        cross-midnight), and the candidate's DWH order appears in no other slot.
+        Such an order always ends up MATCHED to that candidate.
+
+    Args:
+        order_bucket (np.ndarray): Same-day bucket id per order (-1 = none).
+        order_prev_bucket (np.ndarray): Previous-day bucket id per order (-1 = none).
+        bucket_offsets (np.ndarray): Bucket b owns slots bucket_offsets[b]:bucket_offsets[b + 1].
+        slot_gp (np.ndarray): gp_order_id code per candidate slot.
+        n_gp_codes (int): Number of distinct gp codes.
+
+    Returns:
+        np.ndarray: Boolean mask over orders.
+    """
+    n_buckets = len(bucket_offsets) - 1
+    bucket_refs = (
+        np.bincount(order_bucket[order_bucket >= 0], minlength=n_buckets)
+        + np.bincount(order_prev_bucket[order_prev_bucket >= 0], minlength=n_buckets)
+    )
+    gp_slot_counts = np.bincount(slot_gp, minlength=n_gp_codes)
+    uncontested = (
+        (np.diff(bucket_offsets) == 1)
+        & (bucket_refs == 1)
+        & (gp_slot_counts[slot_gp[bucket_offsets[:-1]]] == 1)
+    )
+
+    direct = np.zeros(len(order_bucket), dtype=bool)
+    has_bucket = np.flatnonzero(order_bucket >= 0)
+    direct[has_bucket] = uncontested[order_bucket[has_bucket]]
+    return direct
+
+
+def _match_orders(
+    processing_order: np.ndarray,
+    order_bucket: np.ndarray,
+    order_prev_bucket: np.ndarray,
+    order_ts_ns: np.ndarray,
+    order_value: np.ndarray,
+    bucket_offsets: np.ndarray,
+    slot_gp: np.ndarray,
+    slot_start_ns: np.ndarray,
+    slot_end_ns: np.ndarray,
+    slot_value: np.ndarray,
+    n_gp_codes: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Description:
+        Matching kernel: assign each order at most one DWH candidate slot, in processing
+        order, using only flat numeric arrays (no frames, dicts or strings).
+
+        Per order: same-day bucket, else previous-day bucket (cross-midnight); a single
+        unused candidate matches directly, several go to timestamp then value resolution.
+        A DWH order (gp code) can be matched once.
 
-    return None, "NO_VALUE_MATCH"
+        Two phases: uncontested orders (see _uncontested_orders) are matched in one
+        vectorised pass, since their outcome does not depend on processing order; only
+        the remainder runs through the sequential loop.
+
+    Args:
+        processing_order (np.ndarray): Order indices in the sequence they claim candidates.
+        order_bucket (np.ndarray): Same-day bucket id per order (-1 = none).
+        order_prev_bucket (np.ndarray): Previous-day bucket id per order (-1 = none).
+        order_ts_ns (np.ndarray): DR delivery timestamp per order (int64 ns, NAT_NS if missing).
+        order_value (np.ndarray): DR net_sales_value per order.
+        bucket_offsets (np.ndarray): Bucket b owns slots bucket_offsets[b]:bucket_offsets[b + 1].
+        slot_gp (np.ndarray): gp_order_id code per candidate slot.
+        slot_start_ns (np.ndarray): Timestamp window start per slot (int64 ns).
+        slot_end_ns (np.ndarray): Timestamp window end per slot (int64 ns).
+        slot_value (np.ndarray): DWH post_promo_sales_inc_vat per slot.
+        n_gp_codes (int): Number of distinct gp codes.
+
+    Returns:
+        tuple: (matched slot per order or -1, status code per order)
+    """
+    n_orders = len(order_bucket)
+    matched_slots = np.full(n_orders, -1, dtype=np.intp)
+    status_codes = np.full(n_orders, _NO_DWH_RECORD, dtype=np.int8)
+    used = np.zeros(n_gp_codes, dtype=bool)
+
+    # Phase 1: uncontested orders take their single same-day candidate, all at once
+    direct = _uncontested_orders(order_bucket, order_prev_bucket, bucket_offsets, slot_gp, n_gp_codes)
+    matched_slots[direct] = bucket_offsets[order_bucket[direct]]
+    status_codes[direct] = _MATCHED
+    used[slot_gp[matched_slots[direct]]] = True
+
+    # Phase 2: everything else, sequentially in processing order
+    all_slots = np.arange(len(slot_gp))
+    no_slots = all_slots[:0]
+
+    def unused_slots(bucket: int) -> np.ndarray:
+        """Return the bucket's slots whose DWH order is not already matched."""
+        if bucket < 0:
+            return no_slots
+        start = bucket_offsets[bucket]
+        end = bucket_offsets[bucket + 1]
+        if end - start == 1:
+            # Dominant single-candidate case: one flag read, returns a view
+            return no_slots if used[slot_gp[start]] else all_slots[start:end]
+        return start + np.flatnonzero(~used[slot_gp[start:end]])
+
+    for i in processing_order[~direct[processing_order]]:
+        slots = unused_slots(order_bucket[i])
+        cross_midnight = False
+        if len(slots) == 0:
+            slots = unused_slots(order_prev_bucket[i])
+            cross_midnight = len(slots) > 0
+
+        if len(slots) == 0:
+            continue                                    # _NO_DWH_RECORD
+        elif len(slots) == 1:
+            slot = slots[0]
+            status = _MATCHED_CROSS_MIDNIGHT if cross_midnight else _MATCHED
+        else:
+            hit, _ = _resolve_collision_by_timestamp(order_ts_ns[i], slot_start_ns[slots], slot_end_ns[slots])
+            status = _MATCHED_BY_TIMESTAMP
+            if hit < 0:
+                hit, _ = _resolve_collision_by_value(order_value[i], slot_value[slots])
+                status = _MATCHED_BY_VALUE
+            if hit < 0:
+                status_codes[i] = _COLLISION
+                continue
+            slot = slots[hit]
+
+        status_codes[i] = status
+        matched_slots[i] = slot
+        used[slot_gp[slot]] = True
+
+    return matched_slots, status_codes
 
 
 def match_deliveroo_orders(
@@ -543,17 +825,19 @@ def match_deliveroo_orders(
     if "accounting_category" not in dr_df.columns:
         dr_df["accounting_category"] = "Order Value & Commission"
 
-    orders_df = dr_df[dr_df["accounting_category"] == "Order Value & Commission"].copy()
-    fees_df = dr_df[dr_df["accounting_category"] == "Additional Fees"].copy()
-    payments_df = dr_df[dr_df["accounting_category"] == "Additional Payments"].copy()
+    # Row-type masks, computed once and shared with aggregation and Step 5 (no filtered copies)
+    category = dr_df["accounting_category"].to_numpy()
+    is_order = category == "Order Value & Commission"
+    is_fee = category == "Additional Fees"
+    is_payment = category == "Additional Payments"
 
-    log(f"Deliveroo breakdown: {len(orders_df):,} orders, {len(fees_df):,} fees, {len(payments_df):,} payments")
+    log(f"Deliveroo breakdown: {is_order.sum():,} orders, {is_fee.sum():,} fees, {is_payment.sum():,} payments")
 
-    # Prepare DWH for matching - only completed orders
-    dwh_completed = dwh_df[dwh_df["order_completed"] == 1].copy()
+    # Prepare DWH for matching - only completed orders (read-only below, so no copy)
+    dwh_completed = dwh_df[dwh_df["order_completed"] == 1]
     log(f"DWH completed Deliveroo orders: {len(dwh_completed):,}")
 
-    if orders_df.empty:
+    if not is_order.any():
         log("Warning: No order rows found")
         dr_df["order_category"] = "No Orders"
         dr_df["match_status"] = "N/A"
@@ -562,7 +846,7 @@ def match_deliveroo_orders(
     # -----------------------------------------------------------------------------------------
     # Step 2: Aggregate orders with their adjustments
     # -----------------------------------------------------------------------------------------
-    agg_df = aggregate_order_values(dr_df)
+    agg_df = _aggregate_orders(dr_df, is_order, is_fee)
     orders_with_refunds = (agg_df["has_refund"] == True).sum()
     log(f"Aggregated to {len(agg_df):,} unique orders ({orders_with_refunds:,} with refund adjustments)")
 
@@ -572,250 +856,196 @@ def match_deliveroo_orders(
         dr_df["match_status"] = "N/A"
         return dr_df
 
-    # Get delivery timestamps from original orders for collision resolution
-    order_timestamps = orders_df.set_index("order_number")["dr_delivery_ts"].to_dict()
-
     # -----------------------------------------------------------------------------------------
-    # Step 3: Build DWH lookup with timestamps for collision resolution
-    # Key: (last4, mfc, date) -> list of dicts with gp_order_id, dwh_value, timestamps
+    # Step 3: Build DWH candidate table with timestamps for collision resolution
+    # Candidates are bucketed by key (last4 code, mfc code, day number) and stored flat:
+    # bucket b owns candidate slots bucket_offsets[b]:bucket_offsets[b + 1]
     # -----------------------------------------------------------------------------------------
-    dwh_lookup: Dict[Tuple[str, str, Any], List[Dict]] = {}
-
-    for idx, row in dwh_completed.iterrows():
-        mp_id = str(row.get("mp_order_id", "")).strip()
-        loc = str(row.get("location_name", "")).strip()
-        order_date = row.get("created_at_day")
-        dwh_value = float(row.get("post_promo_sales_inc_vat", 0) or 0)
-        gp_order_id = row.get("gp_order_id")
-        created_at_ts = row.get("created_at_ts")
-        delivered_at_ts = row.get("delivered_at_ts")
-
-        if mp_id and loc and mp_id != "nan":
-            key = (mp_id, loc, order_date)
-            if key not in dwh_lookup:
-                dwh_lookup[key] = []
-            dwh_lookup[key].append({
-                "idx": idx,
-                "gp_order_id": gp_order_id,
-                "dwh_value": dwh_value,
-                "created_at_ts": created_at_ts,
-                "delivered_at_ts": delivered_at_ts,
-            })
+    def column_values(df: pd.DataFrame, col: str, default: Any = None) -> np.ndarray:
+        """Return a column as an object ndarray (missing column -> all default)."""
+        if col not in df.columns:
+            return np.full(len(df), default, dtype=object)
+        return df[col].to_numpy(dtype=object)
+
+    def timestamp_ns(df: pd.DataFrame, col: str) -> np.ndarray:
+        """Return a timestamp column as int64 ns (missing column -> all NAT_NS)."""
+        if col not in df.columns:
+            return np.full(len(df), NAT_NS, dtype=np.int64)
+        return _to_ns(df[col].to_numpy())
+
+    # Pull each column out once as a plain ndarray
+    dwh_mp_ids = dwh_completed["mp_order_id"].astype(str).str.strip().to_numpy()
+    dwh_locs = dwh_completed["location_name"].astype(str).str.strip().to_numpy()
+    dwh_dates = column_values(dwh_completed, "created_at_day")
+    dwh_values = column_values(dwh_completed, "post_promo_sales_inc_vat", 0.0).astype(float)
+
+    # gp_order_id -> dense integer code (a DWH order can span several rows, which share a code;
+    # rows with no gp_order_id share one code too, so once one is used they all are, as with the
+    # old used-ID set), so "used" is a flag array, not a set
+    gp_codes, gp_uniques = pd.factorize(column_values(dwh_completed, "gp_order_id"))
+    gp_codes[gp_codes < 0] = len(gp_uniques)
+    n_gp_codes = len(gp_uniques) + 1
+
+    dwh_created_ns = timestamp_ns(dwh_completed, "created_at_ts")
+    dwh_delivered_ns = timestamp_ns(dwh_completed, "delivered_at_ts")
+
+    # Timestamp windows, validated once: a candidate missing either timestamp gets an empty
+    # window (start after end), so it can never match and is never NaT-checked per order
+    ts_valid = (dwh_created_ns != NAT_NS) & (dwh_delivered_ns != NAT_NS)
+    dwh_window_start_ns = np.where(ts_valid, dwh_created_ns, np.iinfo(np.int64).max)
+    dwh_window_end_ns = np.where(ts_valid, dwh_delivered_ns + COLLISION_BUFFER_NS, NAT_NS)
+
+    # Encode the key strings as integer codes (categories defined by the DWH values) and dates
+    # as day numbers, so every key is a tuple of ints
+    mp_codes, mp_categories = pd.factorize(dwh_mp_ids)
+    loc_codes, loc_categories = pd.factorize(dwh_locs)
+    dwh_days = _to_days(dwh_dates)
+
+    # One groupby numbers the buckets; a stable argsort by bucket lays the slots out
+    # contiguously (DWH row order within each bucket)
+    valid_pos = np.flatnonzero((dwh_mp_ids != "") & (dwh_locs != "") & (dwh_mp_ids != "nan"))
+    keyed = pd.DataFrame({
+        "mp": mp_codes[valid_pos], "loc": loc_codes[valid_pos], "day": dwh_days[valid_pos],
+    })
+    bucket_ids = keyed.groupby(["mp", "loc", "day"], sort=False).ngroup().to_numpy()
+    slot_order = np.argsort(bucket_ids, kind="stable")
+    slot_pos = valid_pos[slot_order]   # DWH row position of each slot
+
+    bucket_sizes = np.bincount(bucket_ids, minlength=0)
+    bucket_offsets = np.zeros(len(bucket_sizes) + 1, dtype=np.intp)
+    np.cumsum(bucket_sizes, out=bucket_offsets[1:])
+    bucket_keys = pd.MultiIndex.from_frame(keyed.iloc[slot_order[bucket_offsets[:-1]]])
 
     # Count single vs multiple candidates
-    single_cand = sum(1 for v in dwh_lookup.values() if len(v) == 1)
-    multi_cand = sum(1 for v in dwh_lookup.values() if len(v) > 1)
-    log(f"Built DWH lookup: {len(dwh_lookup):,} keys ({single_cand:,} single, {multi_cand:,} potential collisions)")
+    single_cand = (bucket_sizes == 1).sum()
+    multi_cand = (bucket_sizes > 1).sum()
+    log(f"Built DWH lookup: {len(bucket_sizes):,} keys ({single_cand:,} single, {multi_cand:,} potential collisions)")
 
     # -----------------------------------------------------------------------------------------
     # Step 4: Match aggregated orders to DWH with 4-step priority
-    # Sort by delivery timestamp (earliest first) for consistent matching
+    # Process by delivery date (earliest first) for consistent matching
     # -----------------------------------------------------------------------------------------
-    agg_df_sorted = agg_df.sort_values("delivery_date").copy()
-
-    match_results: Dict[str, Dict] = {}  # order_number -> match info
-    used_dwh_ids: set = set()  # Track matched gp_order_ids to prevent duplicates
-
-    stats = {
-        "matched_direct": 0,
-        "matched_cross_midnight": 0,
-        "matched_by_timestamp": 0,
-        "matched_by_value": 0,
-        "no_dwh_record": 0,
-        "collision": 0,
-        "matched_grouped": 0,
-    }
-
-    for _, agg_row in agg_df_sorted.iterrows():
-        order_num = str(agg_row.get("order_number", ""))
-        dr_last4 = str(agg_row.get("order_last4", "")).strip()
-        dr_mfc = str(agg_row.get("mfc_name", "")).strip()
-        dr_date = agg_row.get("delivery_date")
-        net_value = float(agg_row.get("net_sales_value", 0) or 0)
-        has_refund = agg_row.get("has_refund", False)
-        dr_ts = order_timestamps.get(agg_row.get("order_number"))
-
-        matched_candidate = None
-        match_status = None
-        cross_midnight = False
-
-        # Get candidates for same date
-        key = (dr_last4, dr_mfc, dr_date)
-        candidates = dwh_lookup.get(key, [])
-
-        # Filter out already-used DWH records
-        available = [c for c in candidates if c["gp_order_id"] not in used_dwh_ids]
-
-        # If no match on same date, try previous day (cross-midnight)
-        if not available and dr_date is not None:
-            prev_date = dr_date - timedelta(days=1)
-            prev_key = (dr_last4, dr_mfc, prev_date)
-            prev_candidates = dwh_lookup.get(prev_key, [])
-            available = [c for c in prev_candidates if c["gp_order_id"] not in used_dwh_ids]
-            if available:
-                cross_midnight = True
-
-        # Matching logic with priority
-        if not available:
-            # No candidates found
-            match_status = "NO_DWH_RECORD"
-            stats["no_dwh_record"] += 1
-        elif len(available) == 1:
-            # Single candidate - direct match
-            matched_candidate = available[0]
-            if cross_midnight:
-                match_status = "MATCHED_CROSS_MIDNIGHT"
-                stats["matched_cross_midnight"] += 1
-            else:
-                match_status = "MATCHED"
-                stats["matched_direct"] += 1
-        else:
-            # Multiple candidates - try timestamp resolution
-            matched_candidate, ts_result = _resolve_collision_by_timestamp(dr_ts, available)
-
-            if matched_candidate:
-                match_status = "MATCHED_BY_TIMESTAMP"
-                stats["matched_by_timestamp"] += 1
-            else:
-                # Timestamp failed - try value matching
-                matched_candidate, val_result = _resolve_collision_by_value(net_value, available)
-
-                if matched_candidate:
-                    match_status = "MATCHED_BY_VALUE"
-                    stats["matched_by_value"] += 1
-                else:
-                    # Could not resolve collision
-                    match_status = "COLLISION"
-                    stats["collision"] += 1
-
-        # Derive match_confidence from match_status
-        confidence_map = {
-            "MATCHED": "High",
-            "MATCHED_CROSS_MIDNIGHT": "High (Cross-Midnight)",
-            "MATCHED_BY_TIMESTAMP": "Medium (Timestamp)",
-            "MATCHED_BY_VALUE": "Low (Value)",
-            "NO_DWH_RECORD": "N/A",
-            "COLLISION": "Ambiguous",
-        }
-        match_confidence = confidence_map.get(match_status, "Unknown")
-
-        # Store match result
-        if matched_candidate is not None:
-            dwh_idx = matched_candidate["idx"]
-            dwh_row = dwh_completed.loc[dwh_idx]
-            order_category = "Matched (Grouped)" if has_refund else "Matched"
-            if has_refund:
-                stats["matched_grouped"] += 1
-
-            # Mark this DWH record as used
-            used_dwh_ids.add(matched_candidate["gp_order_id"])
-
-            match_results[order_num] = {
-                "matched": True,
-                "dwh_idx": dwh_idx,
-                "dwh_data": {f"dwh_{col}": dwh_row[col] for col in dwh_row.index},
-                "order_category": order_category,
-                "match_status": match_status,
-                "match_confidence": match_confidence,
-                "cross_midnight": cross_midnight,
-                "net_sales_value": net_value,
-                "gross_order_value": float(agg_row.get("gross_order_value", 0) or 0),
-                "unavailable_items_adjustment": float(agg_row.get("unavailable_items_adjustment", 0) or 0),
-            }
-        else:
-            match_results[order_num] = {
-                "matched": False,
-                "order_category": "Not Matched",
-                "match_status": match_status,
-                "match_confidence": match_confidence,
-                "cross_midnight": cross_midnight,
-                "net_sales_value": net_value,
-                "gross_order_value": float(agg_row.get("gross_order_value", 0) or 0),
-                "unavailable_items_adjustment": float(agg_row.get("unavailable_items_adjustment", 0) or 0),
-            }
+    # Order keys use the DWH codes (-1 = value never seen in DWH, so no bucket can match)
+    agg_order_strs = agg_df["order_number"].astype(str).to_numpy()
+    agg_last4 = pd.Index(mp_categories).get_indexer(
+        agg_df["order_last4"].astype(str).str.strip().to_numpy()
+    )
+    agg_mfcs = pd.Index(loc_categories).get_indexer(
+        agg_df["mfc_name"].astype(str).str.strip().to_numpy()
+    )
+    agg_ts_ns = timestamp_ns(agg_df, "dr_delivery_ts")   # Delivery time for collision resolution
+    agg_days = _to_days(column_values(agg_df, "delivery_date"))
+    agg_prev_days = np.where(agg_days == NAT_NS, NAT_NS, agg_days - 1)   # Cross-midnight probe
+    agg_net = agg_df["net_sales_value"].to_numpy(dtype=float)
+    agg_gross = agg_df["gross_order_value"].to_numpy(dtype=float)
+    agg_unavail = agg_df["unavailable_items_adjustment"].to_numpy(dtype=float)
+    agg_has_refund = agg_df["has_refund"].to_numpy(dtype=bool)
+
+    # Resolve every order's same-day and previous-day bucket up front (vectorised hash lookup)
+    order_bucket = bucket_keys.get_indexer(pd.MultiIndex.from_arrays([agg_last4, agg_mfcs, agg_days]))
+    order_prev_bucket = bucket_keys.get_indexer(
+        pd.MultiIndex.from_arrays([agg_last4, agg_mfcs, agg_prev_days])
+    )
+
+    # Processing order: by delivery day (missing dates last), ties in aggregation order.
+    # One stable argsort of the int64 day numbers; the frame itself is never re-sorted.
+    processing_order = np.argsort(
+        np.where(agg_days == NAT_NS, np.iinfo(np.int64).max, agg_days), kind="stable"
+    )
+
+    matched_slots, status_codes = _match_orders(
+        processing_order, order_bucket, order_prev_bucket, agg_ts_ns, agg_net,
+        bucket_offsets,
+        gp_codes[slot_pos], dwh_window_start_ns[slot_pos], dwh_window_end_ns[slot_pos],
+        dwh_values[slot_pos],
+        n_gp_codes,
+    )
+
+    # Per-order match results, parallel to the agg arrays (joined back to all rows in Step 5)
+    matched = matched_slots >= 0
+    order_dwh_positions = np.full(len(agg_df), -1, dtype=np.intp)   # -1 = not matched
+    order_dwh_positions[matched] = slot_pos[matched_slots[matched]]
+    order_categories_base = np.where(
+        matched, np.where(agg_has_refund, "Matched (Grouped)", "Matched"), "Not Matched"
+    )
+    order_statuses = _MATCH_STATUS_LABELS.take(status_codes)
+    order_confidences = _MATCH_CONFIDENCE_LABELS.take(status_codes)
 
     # Log matching statistics
-    total_matched = stats["matched_direct"] + stats["matched_cross_midnight"] + stats["matched_by_timestamp"] + stats["matched_by_value"]
-    log(f"Matching results: {total_matched:,} matched, {stats['no_dwh_record']:,} no DWH record")
-    log(f"   MATCHED (direct): {stats['matched_direct']:,}")
-    log(f"   MATCHED_CROSS_MIDNIGHT: {stats['matched_cross_midnight']:,}")
-    log(f"   MATCHED_BY_TIMESTAMP: {stats['matched_by_timestamp']:,}")
-    log(f"   MATCHED_BY_VALUE: {stats['matched_by_value']:,}")
-    log(f"   COLLISION (unresolved): {stats['collision']:,}")
-    log(f"   Matched with refund adjustments: {stats['matched_grouped']:,}")
-    log(f"   DWH records used: {len(used_dwh_ids):,}")
+    status_counts = np.bincount(status_codes, minlength=len(_MATCH_STATUS_LABELS))
+    log(f"Matching results: {matched.sum():,} matched, {status_counts[_NO_DWH_RECORD]:,} no DWH record")
+    log(f"   MATCHED (direct): {status_counts[_MATCHED]:,}")
+    log(f"   MATCHED_CROSS_MIDNIGHT: {status_counts[_MATCHED_CROSS_MIDNIGHT]:,}")
+    log(f"   MATCHED_BY_TIMESTAMP: {status_counts[_MATCHED_BY_TIMESTAMP]:,}")
+    log(f"   MATCHED_BY_VALUE: {status_counts[_MATCHED_BY_VALUE]:,}")
+    log(f"   COLLISION (unresolved): {status_counts[_COLLISION]:,}")
+    log(f"   Matched with refund adjustments: {(matched & agg_has_refund).sum():,}")
+    log(f"   DWH records used: {matched.sum():,}")
 
     # -----------------------------------------------------------------------------------------
     # Step 5: Propagate match results back to ALL original rows
     # -----------------------------------------------------------------------------------------
-    result_rows = []
-
-    for _, dr_row in dr_df.iterrows():
-        row_dict = dr_row.to_dict()
-        order_num = str(dr_row.get("order_number", ""))
-        accounting_cat = dr_row.get("accounting_category", "")
-
-        if order_num in match_results:
-            match_info = match_results[order_num]
-
-            # Add aggregated values
-            row_dict["net_sales_value"] = match_info["net_sales_value"]
-            row_dict["gross_order_value"] = match_info["gross_order_value"]
-            row_dict["unavailable_items_adjustment"] = match_info["unavailable_items_adjustment"]
-
-            if match_info["matched"]:
-                # Add DWH data
-                row_dict.update(match_info["dwh_data"])
-
-                # Set category based on row type
-                if accounting_cat == "Order Value & Commission":
-                    row_dict["order_category"] = match_info["order_category"]
-                    row_dict["match_status"] = match_info["match_status"]
-                    row_dict["match_confidence"] = match_info["match_confidence"]
-                else:
-                    # Additional Fees/Payments linked to matched order
-                    row_dict["order_category"] = "Linked to Order"
-                    row_dict["match_status"] = "LINKED"
-                    row_dict["match_confidence"] = "Inherited"
-            else:
-                row_dict["order_category"] = "Not Matched" if accounting_cat == "Order Value & Commission" else "Linked to Unmatched"
-                row_dict["match_status"] = match_info["match_status"]
-                row_dict["match_confidence"] = match_info["match_confidence"]
-        else:
-            # Standalone adjustment (order_number = 0 or not in orders)
-            row_dict["order_category"] = "Standalone Adjustment"
-            row_dict["match_status"] = "N/A"
-            row_dict["match_confidence"] = "N/A"
-            row_dict["net_sales_value"] = 0
-            row_dict["gross_order_value"] = 0
-            row_dict["unavailable_items_adjustment"] = 0
-
-        result_rows.append(row_dict)
-
-    result_df = pd.DataFrame(result_rows)
+    # Hash-join every row to its order's results via the order_number index (-1 = standalone
+    # adjustment: order_number = 0 or not in orders), then derive row-type outcomes with np.where
+    row_order = pd.Index(agg_order_strs).get_indexer(dr_df["order_number"].astype(str).to_numpy())
+    has_order = row_order >= 0
+    row_order = np.where(has_order, row_order, 0)   # Safe take index; masked by has_order below
+    row_matched = has_order & (order_dwh_positions[row_order] >= 0)
+    linked = row_matched & ~is_order   # Additional Fees/Payments linked to matched order
+
+    order_categories = np.where(
+        ~has_order, "Standalone Adjustment",
+        np.where(is_order, order_categories_base[row_order],
+                 np.where(row_matched, "Linked to Order", "Linked to Unmatched")),
+    )
+    match_statuses = np.where(
+        ~has_order, "N/A", np.where(linked, "LINKED", order_statuses[row_order])
+    )
+    match_confidences = np.where(
+        ~has_order, "N/A", np.where(linked, "Inherited", order_confidences[row_order])
+    )
+
+    result_df = dr_df.copy(deep=False)   # New columns only; dr_df's own data is never written
+    result_df["net_sales_value"] = np.where(has_order, agg_net[row_order], 0.0)
+    result_df["gross_order_value"] = np.where(has_order, agg_gross[row_order], 0.0)
+    result_df["unavailable_items_adjustment"] = np.where(has_order, agg_unavail[row_order], 0.0)
+
+    # Add DWH data: gather each row's matched DWH row once (-1 -> all NaN)
+    if row_matched.any():
+        dwh_positions = np.where(row_matched, order_dwh_positions[row_order], -1)
+        dwh_data = dwh_completed.reset_index(drop=True).add_prefix("dwh_").reindex(dwh_positions)
+        dwh_data.index = result_df.index
+        result_df = pd.concat([result_df, dwh_data], axis=1)
+
+    result_df["order_category"] = order_categories
+    result_df["match_status"] = match_statuses
+    result_df["match_confidence"] = match_confidences
 
     # -----------------------------------------------------------------------------------------
     # Step 6: Post-match quality check for high-variance matches
     # -----------------------------------------------------------------------------------------
     if "dwh_post_promo_sales_inc_vat" in result_df.columns:
-        matched_mask = result_df["order_category"].isin(["Matched", "Matched (Grouped)"])
+        matched_mask = result_df["order_category"].isin(["Matched", "Matched (Grouped)"]).to_numpy()
 
         net_val = pd.to_numeric(result_df["net_sales_value"], errors="coerce").fillna(0)
         dwh_val = pd.to_numeric(result_df["dwh_post_promo_sales_inc_vat"], errors="coerce").fillna(0)
 
-        variance_pct = np.where(
-            net_val > 0,
-            np.abs(net_val - dwh_val) / net_val * 100,
-            0
-        )
+        # Computed once here and reused by calculate_variances
+        amount_variance = (net_val.round(2) - dwh_val.round(2)).round(2)
+        result_df["amount_variance"] = amount_variance
 
-        high_variance_mask = matched_mask & (variance_pct > 20)
-        result_df.loc[high_variance_mask, "match_confidence"] = (
-            result_df.loc[high_variance_mask, "match_confidence"] + " - Review"
-        )
+        net_arr = net_val.to_numpy()
+        candidates = matched_mask & (net_arr > 0)
+        variance_pct = np.zeros(len(result_df))
+        variance_pct[candidates] = np.abs(amount_variance.to_numpy()[candidates]) / net_arr[candidates] * 100
 
+        high_variance_mask = variance_pct > 20
         review_count = high_variance_mask.sum()
+
         if review_count > 0:
+            # Append the flag on the Step 5 confidence array (no intermediate Series)
+            match_confidences[high_variance_mask] = match_confidences[high_variance_mask] + " - Review"
+            result_df["match_confidence"] = match_confidences
             log(f"   Flagged for review (>20% variance): {review_count:,}")
 
     return result_df
@@ -829,6 +1059,7 @@ def calculate_variances(df: pd.DataFrame) -> pd.DataFrame:
     """
     Description:
         Calculate variance between Deliveroo net_sales_value (grouped) and DWH post_promo_sales_inc_vat.
+        Works on a shallow copy: only whole columns are assigned, so the input frame is untouched.
 
         Field Mapping:
             - net_sales_value = gross_order_value + unavailable_items_adjustment
@@ -848,7 +1079,7 @@ def calculate_variances(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Data with variance columns added.
     """
-    df = df.copy()
+    df = df.copy(deep=False)
 
     # Calculate variance for matched orders (both simple and grouped matches)
     matched_mask = df["order_category"].isin(["Matched", "Matched (Grouped)"])
@@ -858,43 +1089,36 @@ def calculate_variances(df: pd.DataFrame) -> pd.DataFrame:
     # where gross_order_value = order_value_gross + marketing_offer_discount
 
     if "dwh_post_promo_sales_inc_vat" in df.columns and "net_sales_value" in df.columns:
-        # Calculate variance
-        net_val = pd.to_numeric(df["net_sales_value"], errors="coerce").fillna(0)
-        dwh_val = pd.to_numeric(df["dwh_post_promo_sales_inc_vat"], errors="coerce").fillna(0)
-
-        df["amount_variance"] = (net_val.round(2) - dwh_val.round(2)).round(2)
-
-        # Classify variance for matched rows
-        abs_variance = df["amount_variance"].abs()
-
-        # Initialize columns
-        df["matched_amount"] = "N/A"
-        df["variance_explanation"] = "N/A"
-
-        # Exact match (< £0.02)
-        exact_mask = matched_mask & (abs_variance < 0.02)
-        df.loc[exact_mask, "matched_amount"] = "Exact Match"
-        df.loc[exact_mask, "variance_explanation"] = "Exact Match"
-
-        # Rounding (£0.02 - £0.10)
-        rounding_mask = matched_mask & (abs_variance >= 0.02) & (abs_variance < 0.10)
-        df.loc[rounding_mask, "matched_amount"] = "Exact Match"  # Still consider matched
-        df.loc[rounding_mask, "variance_explanation"] = "Rounding"
-
-        # Minor variance (£0.10 - £1.00)
-        minor_mask = matched_mask & (abs_variance >= 0.10) & (abs_variance < 1.00)
-        df.loc[minor_mask, "matched_amount"] = "Minor Variance"
-        df.loc[minor_mask, "variance_explanation"] = "Minor Variance"
-
-        # Unexplained variance (>= £1.00)
-        unexplained_mask = matched_mask & (abs_variance >= 1.00)
-        df.loc[unexplained_mask, "matched_amount"] = "Value Variance"
-        df.loc[unexplained_mask, "variance_explanation"] = "Unexplained Variance"
-
-        # Linked rows inherit parent's variance
-        linked_mask = df["order_category"] == "Linked to Order"
-        df.loc[linked_mask, "matched_amount"] = "Linked"
-        df.loc[linked_mask, "variance_explanation"] = "See Parent Order"
+        # Calculate variance (match_deliveroo_orders already attaches it; only compute if absent)
+        if "amount_variance" not in df.columns:
+            net_val = pd.to_numeric(df["net_sales_value"], errors="coerce").fillna(0)
+            dwh_val = pd.to_numeric(df["dwh_post_promo_sales_inc_vat"], errors="coerce").fillna(0)
+            df["amount_variance"] = (net_val.round(2) - dwh_val.round(2)).round(2)
+
+        # Classify variance for matched rows in one np.select pass (first true condition wins):
+        # Exact Match (< £0.02), Rounding (< £0.10, still considered matched),
+        # Minor Variance (< £1.00), Unexplained Variance (>= £1.00)
+        abs_variance = df["amount_variance"].abs().to_numpy()
+        matched = matched_mask.to_numpy()
+        conditions = [
+            matched & (abs_variance < 0.02),
+            matched & (abs_variance < 0.10),
+            matched & (abs_variance < 1.00),
+            matched & (abs_variance >= 1.00),
+            # Linked rows inherit parent's variance
+            (df["order_category"] == "Linked to Order").to_numpy(),
+        ]
+
+        df["matched_amount"] = np.select(
+            conditions,
+            ["Exact Match", "Exact Match", "Minor Variance", "Value Variance", "Linked"],
+            default="N/A",
+        )
+        df["variance_explanation"] = np.select(
+            conditions,
+            ["Exact Match", "Rounding", "Minor Variance", "Unexplained Variance", "See Parent Order"],
+            default="N/A",
+        )
 
     else:
         df["amount_variance"] = 0
@@ -903,7 +1127,7 @@ def calculate_variances(df: pd.DataFrame) -> pd.DataFrame:
 
     # Set for non-matched/non-linked rows
     non_matched_mask = ~df["order_category"].isin(["Matched", "Matched (Grouped)", "Linked to Order"])
-    df.loc[non_matched_mask, "amount_variance"] = 0
+    df["amount_variance"] = df["amount_variance"].mask(non_matched_mask, 0)
 
     return df
 
@@ -976,28 +1200,38 @@ def run_dr_reconciliation(
         log("Step 4: Calculate Variances")
         final_df = calculate_variances(merged_df)
 
+        # Low-cardinality label columns as categoricals: the summary masks and counts below
+        # then work on small integer codes instead of Python strings
+        for col in ("order_category", "accounting_category", "variance_explanation", "matched_amount"):
+            if col in final_df.columns:
+                final_df[col] = final_df[col].astype("category")
+
         # 5) Summary statistics
         log("")
         log("=" * 60)
         log("RECONCILIATION SUMMARY")
         log("=" * 60)
 
+        # Row-type masks, computed once (category code comparisons) and reused as plain arrays
+        order_mask = (final_df["accounting_category"] == "Order Value & Commission").to_numpy()
+        matched_mask = final_df["order_category"].isin(["Matched", "Matched (Grouped)"]).to_numpy()
+
         # Row category breakdown
         log("")
         log("Row Categories:")
         category_order = ["Matched", "Matched (Grouped)", "Linked to Order", "Not Matched",
                          "Linked to Unmatched", "Standalone Adjustment"]
+        cat_counts = final_df["order_category"].value_counts()
         for cat in category_order:
-            if cat in final_df["order_category"].values:
-                count = (final_df["order_category"] == cat).sum()
+            count = cat_counts.get(cat, 0)
+            if count > 0:
                 log(f"   {cat}: {count:,}")
 
         # Grouped matching statistics
         log("")
         log("Grouping Statistics:")
-        order_mask = final_df["accounting_category"] == "Order Value & Commission"
-        matched_simple = (final_df["order_category"] == "Matched").sum()
-        matched_grouped = (final_df["order_category"] == "Matched (Grouped)").sum()
+        matched_simple = cat_counts.get("Matched", 0)
+        matched_grouped = cat_counts.get("Matched (Grouped)", 0)
         total_orders = order_mask.sum()
         orders_with_adjustments = matched_grouped
 
@@ -1007,8 +1241,9 @@ def run_dr_reconciliation(
 
         # Adjustment totals
         if "unavailable_items_adjustment" in final_df.columns:
-            adj_mask = final_df["order_category"].isin(["Matched", "Matched (Grouped)"])
-            adjustment_total = final_df.loc[adj_mask & order_mask, "unavailable_items_adjustment"].sum()
+            # Sum-over-mask as a dot product (column is NaN-free: Step 5 fills 0.0), no .loc slice
+            adj_values = final_df["unavailable_items_adjustment"].to_numpy(dtype=float)
+            adjustment_total = float(np.dot(matched_mask & order_mask, adj_values))
             if adjustment_total != 0:
                 log(f"   Net adjustment value: £{adjustment_total:,.2f}")
 
@@ -1017,46 +1252,54 @@ def run_dr_reconciliation(
             log("")
             log("Variance Analysis (Matched Orders):")
             variance_order = ["Exact Match", "Rounding", "Minor Variance", "Unexplained Variance"]
+            var_counts = final_df["variance_explanation"].value_counts()
             for var_type in variance_order:
-                if var_type in final_df["variance_explanation"].values:
-                    count = (final_df["variance_explanation"] == var_type).sum()
+                count = var_counts.get(var_type, 0)
+                if count > 0:
                     log(f"   {var_type}: {count:,}")
 
         # Financial summary
         log("")
         log("Financial Summary:")
 
-        order_rows = final_df[final_df["accounting_category"] == "Order Value & Commission"]
-        matched_orders = order_rows[order_rows["order_category"].isin(["Matched", "Matched (Grouped)"])]
+        order_rows = final_df[order_mask]
+        matched_orders = final_df[order_mask & matched_mask]
+
+        # One sum() per frame covers every financial column present
+        order_cols = ["order_value_gross", "marketing_offer_discount", "gross_order_value",
+                      "unavailable_items_adjustment", "net_sales_value"]
+        order_sums = order_rows[[c for c in order_cols if c in final_df.columns]].sum()
+        dwh_cols = ["dwh_post_promo_sales_inc_vat", "dwh_mp_bag_fee_inc_vat"]
+        matched_sums = matched_orders[[c for c in dwh_cols if c in final_df.columns]].sum()
 
-        if "order_value_gross" in final_df.columns:
-            order_value_total = order_rows["order_value_gross"].sum()
+        if "order_value_gross" in order_sums:
+            order_value_total = order_sums["order_value_gross"]
             log(f"   Deliveroo Order Value (net): £{order_value_total:,.2f}")
 
-        if "marketing_offer_discount" in final_df.columns:
-            marketing_total = order_rows["marketing_offer_discount"].sum()
+        if "marketing_offer_discount" in order_sums:
+            marketing_total = order_sums["marketing_offer_discount"]
             if marketing_total != 0:
                 log(f"   Marketing Discounts: £{marketing_total:,.2f}")
 
-        if "gross_order_value" in final_df.columns:
-            gross_total = order_rows["gross_order_value"].sum()
+        if "gross_order_value" in order_sums:
+            gross_total = order_sums["gross_order_value"]
             log(f"   Gross Order Value: £{gross_total:,.2f}")
 
-        if "unavailable_items_adjustment" in final_df.columns:
-            adj_total = order_rows["unavailable_items_adjustment"].sum()
+        if "unavailable_items_adjustment" in order_sums:
+            adj_total = order_sums["unavailable_items_adjustment"]
             if adj_total != 0:
                 log(f"   Unavailable Items Adjustment: £{adj_total:,.2f}")
 
-        if "net_sales_value" in final_df.columns:
-            net_total = order_rows["net_sales_value"].sum()
+        if "net_sales_value" in order_sums:
+            net_total = order_sums["net_sales_value"]
             log(f"   Net Sales Value (comparable): £{net_total:,.2f}")
 
-        if "dwh_post_promo_sales_inc_vat" in final_df.columns:
-            dwh_product_total = matched_orders["dwh_post_promo_sales_inc_vat"].sum()
+        if "dwh_post_promo_sales_inc_vat" in matched_sums:
+            dwh_product_total = matched_sums["dwh_post_promo_sales_inc_vat"]
             log(f"   DWH Product Sales (matched): £{dwh_product_total:,.2f}")
 
-        if "dwh_mp_bag_fee_inc_vat" in final_df.columns:
-            dwh_bag_fee_total = matched_orders["dwh_mp_bag_fee_inc_vat"].sum()
+        if "dwh_mp_bag_fee_inc_vat" in matched_sums:
+            dwh_bag_fee_total = matched_sums["dwh_mp_bag_fee_inc_vat"]
             if dwh_bag_fee_total != 0:
                 log(f"   DWH Bag Fees (matched): £{dwh_bag_fee_total:,.2f}")
 
@@ -24,6 +24,8 @@
 # 1. IMPORTS & CONFIGURATION
 # ====================================================================================================
 from __future__ import annotations
+import hashlib
+import importlib.util
 import sys
 from pathlib import Path
 import pandas as pd
@@ -41,13 +43,124 @@ CONFIG = {
     "dwh_folder": Path(r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\04 Deliveroo\03 DWH"),
     "variance_threshold_pct": 25.0,  # Flag matches with >25% variance
     "sample_size": 15,
+    "use_cache": False,  # Opt-in: reuse parsed loads from AUDIT_CACHE_DIR while the source CSVs are unchanged
 }
 
+# Parsed-load caches live in the project's local cache/ folder, never next to the shared-drive sources.
+# They are pickles, so only files inside this folder are ever read back.
+AUDIT_CACHE_DIR = Path(__file__).resolve().parents[2] / "cache" / "dr99_audit"
+
+# DWH columns the audit uses, with explicit dtypes so each file is parsed without inference.
+# Order IDs stay as strings: the export holds every vendor, and non-Deliveroo IDs are not numeric.
+DWH_DTYPES = {
+    "mp_order_id": "string",
+    "location_name": "string",
+    "created_at_day": "string",
+    "order_vendor": "category",
+    "post_promo_sales_inc_vat": "float32",
+    "gp_order_id": "string",
+}
+DWH_COLS = list(DWH_DTYPES)
+
+# Reconciliation columns the audit reads; everything else in the DR02 output is skipped on load
+AUDIT_REQUIRED_COLS = [
+    "order_number", "order_last4", "mfc_name", "delivery_date", "accounting_category",
+    "order_category", "matched_amount", "variance_explanation", "amount_variance",
+    "order_value_gross", "marketing_offer_discount", "unavailable_items_adjustment",
+    "total_payable", "dwh_post_promo_sales_inc_vat", "dwh_created_at_day", "note",
+]
+
+# The Combined file only feeds the Deliveroo duplicate-key check
+COMBINED_KEY_COLS = ["order_last4", "mfc_name", "delivery_date"]
+
+# Money columns (matched by suffix) are held as float32: pennies up to ~£100k are exact enough
+# for a diagnostic, at half the memory of float64
+MONEY_SUFFIXES = ("_value", "_vat", "_discount", "_payable", "_fee", "_adjustment", "_sales")
+
+# pyarrow's multithreaded CSV parser is used when installed (it is not a project requirement);
+# otherwise pandas' C parser
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
 
 # ====================================================================================================
 # 2. DATA LOADING
 # ====================================================================================================
 
+def read_csv(filepath: Path, **kwargs) -> pd.DataFrame:
+    """Read a whole CSV with the fastest available engine (numpy-backed dtypes either way)."""
+    if CSV_ENGINE == "pyarrow":
+        return pd.read_csv(filepath, engine="pyarrow", **kwargs)
+    return pd.read_csv(filepath, engine="c", low_memory=False, **kwargs)
+
+
+def downcast_money(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast numeric money columns (see MONEY_SUFFIXES) to float32 in place."""
+    money_cols = [
+        c for c in df.columns
+        if c.endswith(MONEY_SUFFIXES) and pd.api.types.is_numeric_dtype(df[c])
+    ]
+    if money_cols:
+        df[money_cols] = df[money_cols].astype("float32")
+    return df
+
+
+def as_money(values: pd.Series) -> pd.Series:
+    """Upcast a (float32) money column to float64 pennies before arithmetic or totals."""
+    return values.astype("float64").round(2)
+
+
+def numeric_order_ids(values: pd.Series) -> pd.Series:
+    """Normalise text order IDs to whole numbers ("46", "46.0" -> 46); non-numeric -> <NA>."""
+    return np.trunc(pd.to_numeric(values, errors="coerce")).astype("Int64")
+
+
+def cache_name(source: Path, kind: str) -> str:
+    """Cache file name for one source: its stem plus a short hash of its full path (stems repeat across folders)."""
+    path_hash = hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest()[:10]
+    return f"{source.stem}.{kind}.{path_hash}.pkl"
+
+
+def cached_load(sources: List[Path], cache_name: str, loader, version: Tuple = ()) -> pd.DataFrame:
+    """
+    Return loader()'s DataFrame, via a pickle in AUDIT_CACHE_DIR that is reused for as long as
+    the sources (paths, sizes, mtimes) and the version tuple are unchanged. Off unless CONFIG["use_cache"].
+    """
+    if not CONFIG["use_cache"]:
+        return loader()
+    
+    # The cache file must be a regular file directly inside the local cache folder
+    cache_dir = AUDIT_CACHE_DIR.resolve()
+    cache_path = cache_dir / cache_name
+    if cache_path.parent != cache_dir or cache_path.is_symlink():
+        print(f"   Warning: Refusing cache path outside {cache_dir}: {cache_name}")
+        return loader()
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        print(f"   Warning: Could not create cache folder {cache_dir}: {e}")
+        return loader()
+    
+    signature = (
+        tuple(sorted((str(p.resolve()), p.stat().st_size, p.stat().st_mtime_ns) for p in sources)),
+        version,
+    )
+    if cache_path.is_file():
+        try:
+            cached = pd.read_pickle(cache_path)
+            if cached["signature"] == signature:
+                print(f"   Using cache: {cache_path.name}")
+                return cached["df"]
+        except Exception as e:
+            print(f"   Warning: Ignoring unreadable cache {cache_path.name}: {e}")
+    
+    df = loader()
+    try:
+        pd.to_pickle({"signature": signature, "df": df}, cache_path)
+    except Exception as e:
+        print(f"   Warning: Could not write cache {cache_path.name}: {e}")
+    return df
+
+
 def load_reconciliation(filepath: Path) -> pd.DataFrame:
     """Load the reconciliation CSV output from DR02."""
     print(f"\n{'='*80}")
@@ -55,7 +168,22 @@ def load_reconciliation(filepath: Path) -> pd.DataFrame:
     print(f"{'='*80}")
     print(f"   File: {filepath.name}")
     
-    df = pd.read_csv(filepath, low_memory=False)
+    def parse() -> pd.DataFrame:
+        # Header first, so usecols is a plain list (supported by both CSV engines)
+        header = pd.read_csv(filepath, nrows=0).columns
+        df = downcast_money(read_csv(filepath, usecols=[c for c in header if c in AUDIT_REQUIRED_COLS]))
+        
+        # Label columns have a handful of values: store as category codes
+        for col in ("order_category", "accounting_category", "variance_explanation", "matched_amount"):
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        return df
+    
+    df = cached_load(
+        [filepath], cache_name(filepath, "recon"), parse,
+        version=tuple(AUDIT_REQUIRED_COLS),
+    )
+    
     print(f"   Total rows: {len(df):,}")
     print(f"   Total columns: {len(df.columns)}")
     
@@ -63,15 +191,33 @@ def load_reconciliation(filepath: Path) -> pd.DataFrame:
 
 
 def load_combined(filepath: Path) -> pd.DataFrame:
-    """Load the Deliveroo Combined CSV from DR01."""
+    """Load the Deliveroo Combined CSV from DR01 (only the duplicate-key columns are parsed)."""
     print(f"\n   Loading Combined file: {filepath.name}")
     
-    df = pd.read_csv(filepath, low_memory=False)
+    header = pd.read_csv(filepath, nrows=0).columns
+    df = read_csv(filepath, usecols=[c for c in header if c in COMBINED_KEY_COLS], dtype="string")
     print(f"   Combined rows: {len(df):,}")
     
     return df
 
 
+def read_dwh_file(filepath: Path) -> pd.DataFrame:
+    """Parse one DWH export: the audit's columns only, Deliveroo rows only."""
+    df = pd.read_csv(
+        filepath,
+        usecols=lambda col: col in DWH_DTYPES,
+        dtype=DWH_DTYPES,
+        low_memory=False,
+        engine="c",
+    )
+    # Filter to Deliveroo per file, so other vendors' rows are never concatenated.
+    # order_vendor is categorical: lower-case the few categories, not every row.
+    if "order_vendor" in df.columns:
+        vendors = df["order_vendor"].cat.categories
+        df = df[df["order_vendor"].isin(vendors[vendors.astype(str).str.lower() == "deliveroo"])]
+    return df
+
+
 def load_dwh(folder: Path) -> pd.DataFrame:
     """Load all DWH CSV files (includes historical data)."""
     print(f"\n{'='*80}")
@@ -81,22 +227,22 @@ def load_dwh(folder: Path) -> pd.DataFrame:
     csv_files = list(folder.glob("*.csv"))
     print(f"   Found {len(csv_files)} DWH files")
     
+    # Each DWH export covers one period and is cached on its own (when CONFIG["use_cache"] is on),
+    # so a new period's file is the only one parsed on the next run
     dfs = []
     for f in csv_files:
         try:
-            df = pd.read_csv(f, low_memory=False)
-            dfs.append(df)
+            dfs.append(cached_load(
+                [f], cache_name(f, "dwh"), lambda f=f: read_dwh_file(f),
+                version=tuple(DWH_DTYPES.items()),
+            ))
         except Exception as e:
             print(f"   Warning: Failed to load {f.name}: {e}")
     
     if not dfs:
         raise FileNotFoundError(f"No valid DWH CSV files in {folder}")
     
-    dwh_df = pd.concat(dfs, ignore_index=True)
-    
-    # Filter to Deliveroo only
-    if "order_vendor" in dwh_df.columns:
-        dwh_df = dwh_df[dwh_df["order_vendor"].str.lower() == "deliveroo"].copy()
+    dwh_df = pd.concat(dfs, ignore_index=True, copy=False)
     
     print(f"   Total Deliveroo DWH rows: {len(dwh_df):,}")
     
@@ -139,23 +285,28 @@ def analyse_variance_summary(df: pd.DataFrame) -> pd.DataFrame:
     
     # Calculate variance stats
     if "amount_variance" in variance_df.columns and "dwh_post_promo_sales_inc_vat" in variance_df.columns:
-        variance_df["abs_variance"] = variance_df["amount_variance"].abs()
+        amount_variance = as_money(variance_df["amount_variance"])
+        variance_df["abs_variance"] = amount_variance.abs()
         variance_df["abs_variance_pct"] = (
             variance_df["abs_variance"] / 
-            variance_df["dwh_post_promo_sales_inc_vat"].replace(0, np.nan) * 100
+            as_money(variance_df["dwh_post_promo_sales_inc_vat"]).replace(0, np.nan) * 100
         )
         
         print(f"\n   --- Variance Statistics ---")
-        print(f"   Mean variance: £{variance_df['amount_variance'].mean():,.2f}")
-        print(f"   Median variance: £{variance_df['amount_variance'].median():,.2f}")
-        print(f"   Std deviation: £{variance_df['amount_variance'].std():,.2f}")
+        print(f"   Mean variance: £{amount_variance.mean():,.2f}")
+        print(f"   Median variance: £{amount_variance.median():,.2f}")
+        print(f"   Std deviation: £{amount_variance.std():,.2f}")
         
         print(f"\n   --- Variance % Distribution ---")
-        bins = [(0, 1), (1, 5), (5, 20), (20, 50), (50, np.inf)]
-        for low, high in bins:
-            count = ((variance_df["abs_variance_pct"] >= low) & (variance_df["abs_variance_pct"] < high)).sum()
+        # One binning pass; [low, high) intervals, missing % falls outside every bin
+        distribution = pd.cut(
+            variance_df["abs_variance_pct"],
+            bins=[0, 1, 5, 20, 50, np.inf],
+            labels=["0-1%", "1-5%", "5-20%", "20-50%", ">50%"],
+            right=False,
+        ).value_counts(sort=False)
+        for label, count in distribution.items():
             pct = count / len(variance_df) * 100
-            label = f"{low}-{high}%" if high != np.inf else f">{low}%"
             print(f"   {label:>10}: {count:>6,} ({pct:>5.1f}%)")
     
     # Date match analysis
@@ -173,6 +324,13 @@ def analyse_variance_summary(df: pd.DataFrame) -> pd.DataFrame:
 # 4. COLLISION RISK ANALYSIS
 # ====================================================================================================
 
+def count_duplicate_keys(df: pd.DataFrame, keys: List[str]) -> int:
+    """Count distinct key combinations that occur on more than one row (missing values compare equal)."""
+    # One hash-grouping pass over the key columns instead of duplicated() followed by drop_duplicates()
+    key_sizes = df.groupby(keys, sort=False, observed=True, dropna=False).size()
+    return int((key_sizes.to_numpy() > 1).sum())
+
+
 def analyse_collision_risk(recon_df: pd.DataFrame, dwh_df: pd.DataFrame, combined_df: pd.DataFrame) -> Dict:
     """Analyze collision risks in matching."""
     print(f"\n{'='*80}")
@@ -187,28 +345,20 @@ def analyse_collision_risk(recon_df: pd.DataFrame, dwh_df: pd.DataFrame, combine
     
     # --- DWH Duplicates ---
     print(f"\n   --- DWH Duplicate Keys ---")
-    dwh_df["match_key"] = (
-        dwh_df["mp_order_id"].astype(str) + "|" + 
-        dwh_df["location_name"].astype(str) + "|" + 
-        dwh_df["created_at_day"].astype(str)
-    )
-    dwh_dups = dwh_df.groupby("match_key").size().reset_index(name="count")
-    dwh_dups = dwh_dups[dwh_dups["count"] > 1]
-    results["dwh_duplicates"] = len(dwh_dups)
-    print(f"   Duplicate (last4 + mfc + date) in DWH: {len(dwh_dups):,}")
+    dwh_keys = ["mp_order_id", "location_name", "created_at_day"]
+    # IDs are read as text, so compare them as numbers ("46" == "46.0"); non-numeric IDs keep their text
+    mp_ids = numeric_order_ids(dwh_df["mp_order_id"]).astype("string").fillna(dwh_df["mp_order_id"])
+    dwh_dups = count_duplicate_keys(dwh_df[dwh_keys].assign(mp_order_id=mp_ids), dwh_keys)
+    results["dwh_duplicates"] = dwh_dups
+    print(f"   Duplicate (last4 + mfc + date) in DWH: {dwh_dups:,}")
     
     # --- Deliveroo Duplicates ---
     print(f"\n   --- Deliveroo Duplicate Keys ---")
     if "order_last4" in combined_df.columns and "mfc_name" in combined_df.columns:
-        combined_df["match_key"] = (
-            combined_df["order_last4"].astype(str) + "|" + 
-            combined_df["mfc_name"].astype(str) + "|" + 
-            combined_df["delivery_date"].astype(str)
-        )
-        dr_dups = combined_df.groupby("match_key").size().reset_index(name="count")
-        dr_dups = dr_dups[dr_dups["count"] > 1]
-        results["dr_duplicates"] = len(dr_dups)
-        print(f"   Duplicate keys in Deliveroo data: {len(dr_dups):,}")
+        dr_keys = ["order_last4", "mfc_name", "delivery_date"]
+        dr_dups = count_duplicate_keys(combined_df, dr_keys)
+        results["dr_duplicates"] = dr_dups
+        print(f"   Duplicate keys in Deliveroo data: {dr_dups:,}")
     
     # --- Zero Order Numbers ---
     print(f"\n   --- Zero/Missing Order Numbers ---")
@@ -219,7 +369,8 @@ def analyse_collision_risk(recon_df: pd.DataFrame, dwh_df: pd.DataFrame, combine
     if len(zero_orders) > 0:
         print(f"\n   Breakdown by accounting_category:")
         for cat, count in zero_orders["accounting_category"].value_counts().items():
-            print(f"      {cat}: {count:,}")
+            if count > 0:   # categorical value_counts also lists unused categories
+                print(f"      {cat}: {count:,}")
     
     return results
 
@@ -228,14 +379,73 @@ def analyse_collision_risk(recon_df: pd.DataFrame, dwh_df: pd.DataFrame, combine
 # 5. PRIOR PERIOD LOOKUP
 # ====================================================================================================
 
+def closest_candidates(
+    cand_owner: np.ndarray,
+    cand_values: np.ndarray,
+    expected: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    For each owner row, find the candidate whose value is closest to the owner's expected value.
+    Ties go to the earliest candidate (array order); NaN values never win.
+    Returns (candidate index or -1, abs diff or NaN) per owner row.
+    """
+    n_rows = len(expected)
+    best_idx = np.full(n_rows, -1, dtype=np.intp)
+    best_diff = np.full(n_rows, np.nan)
+    
+    abs_diff = np.abs(cand_values - expected[cand_owner])
+    valid = np.flatnonzero(~np.isnan(abs_diff))
+    if len(valid) == 0:
+        return best_idx, best_diff
+    
+    # Stable sort by (owner, diff): the first entry of each owner run is its best candidate
+    order = valid[np.lexsort((abs_diff[valid], cand_owner[valid]))]
+    owners = cand_owner[order]
+    first = np.concatenate([[True], owners[1:] != owners[:-1]])
+    best_idx[owners[first]] = order[first]
+    best_diff[owners[first]] = abs_diff[order[first]]
+    return best_idx, best_diff
+
+
+def build_dwh_key_index(dwh_df: pd.DataFrame) -> Dict:
+    """
+    Factorize the DWH (mp_order_id, location_name) keys once - the build side of the prior-period
+    lookup. The result can be passed to lookup_prior_period_orders for any number of probes.
+    """
+    mp_ids = numeric_order_ids(dwh_df["mp_order_id"])
+    if "location_name" in dwh_df.columns:
+        # Missing locations key as "nan" (str of a float NaN), whatever dtype the column was read with
+        locs = dwh_df["location_name"].astype(str).where(dwh_df["location_name"].notna(), "nan")
+    else:
+        locs = pd.Series("", index=dwh_df.index)
+    valid = (mp_ids.notna() & (locs != "")).to_numpy()
+    keyed = dwh_df[valid]
+    for col, default in (("gp_order_id", None), ("created_at_day", None), ("post_promo_sales_inc_vat", 0)):
+        if col not in keyed.columns:
+            keyed = keyed.assign(**{col: default})
+    
+    # Variance-row keys are probed through the same uniques (IDs as their string form)
+    mp_codes, mp_uniques = pd.factorize(mp_ids[valid])
+    loc_codes, loc_uniques = pd.factorize(locs[valid])
+    return {
+        "rows": keyed[["gp_order_id", "created_at_day", "post_promo_sales_inc_vat"]],
+        "mp_codes": mp_codes,
+        "loc_codes": loc_codes,
+        "mp_lookup": pd.Index(np.asarray(mp_uniques, dtype=np.int64).astype(str)),
+        "loc_lookup": pd.Index(loc_uniques),
+    }
+
+
 def lookup_prior_period_orders(
     variance_df: pd.DataFrame, 
     dwh_df: pd.DataFrame,
-    threshold_pct: float = 25.0
+    threshold_pct: float = 25.0,
+    dwh_index: Optional[Dict] = None,
 ) -> pd.DataFrame:
     """
     For high-variance matches, search DWH across all periods to find the correct order.
     This handles cases where adjustments appear in current period but order was from prior month.
+    Pass a build_dwh_key_index() result as dwh_index to skip rebuilding it on repeated calls.
     """
     print(f"\n{'='*80}")
     print("5. PRIOR PERIOD ORDER LOOKUP")
@@ -248,11 +458,12 @@ def lookup_prior_period_orders(
     # Filter to high-variance rows (likely wrong matches or prior period)
     if "abs_variance_pct" not in variance_df.columns:
         variance_df["abs_variance_pct"] = (
-            variance_df["amount_variance"].abs() / 
-            variance_df["dwh_post_promo_sales_inc_vat"].replace(0, np.nan) * 100
+            as_money(variance_df["amount_variance"]).abs() / 
+            as_money(variance_df["dwh_post_promo_sales_inc_vat"]).replace(0, np.nan) * 100
         )
     
-    high_variance = variance_df[variance_df["abs_variance_pct"] > threshold_pct].copy()
+    # query() evaluates with numexpr (multithreaded) when it is installed, plain NumPy otherwise
+    high_variance = variance_df.query("abs_variance_pct > @threshold_pct").copy()
     print(f"   High variance rows (>{threshold_pct}%): {len(high_variance):,}")
     
     if len(high_variance) == 0:
@@ -261,93 +472,100 @@ def lookup_prior_period_orders(
     
     # Calculate expected value for matching
     high_variance["expected_value"] = (
-        high_variance["order_value_gross"].fillna(0) + 
-        high_variance["marketing_offer_discount"].fillna(0)
+        as_money(high_variance["order_value_gross"]).fillna(0) + 
+        as_money(high_variance["marketing_offer_discount"]).fillna(0)
     )
     
-    # Build DWH lookup by (mp_order_id, location_name) -> all matching rows
-    print(f"\n   Building DWH lookup index...")
-    dwh_lookup: Dict[Tuple[str, str], List[Dict]] = {}
-    
-    for _, row in dwh_df.iterrows():
-        mp_id = str(int(row["mp_order_id"])) if pd.notna(row["mp_order_id"]) else ""
-        loc = str(row.get("location_name", ""))
-        
-        if mp_id and loc:
-            key = (mp_id, loc)
-            if key not in dwh_lookup:
-                dwh_lookup[key] = []
-            dwh_lookup[key].append({
-                "gp_order_id": row.get("gp_order_id"),
-                "created_at_day": row.get("created_at_day"),
-                "post_promo_sales_inc_vat": row.get("post_promo_sales_inc_vat", 0),
-            })
-    
-    print(f"   DWH lookup keys: {len(dwh_lookup):,}")
-    
-    # Search for better matches
-    results = []
-    found_prior = 0
-    not_found = 0
-    
-    for idx, row in high_variance.iterrows():
-        order_last4 = str(row.get("order_last4", "")).strip()
-        mfc_name = str(row.get("mfc_name", "")).strip()
-        expected_val = row["expected_value"]
-        current_dwh_date = row.get("dwh_created_at_day", "")
-        
-        key = (order_last4, mfc_name)
-        
-        result = {
-            "order_number": row.get("order_number"),
-            "order_last4": order_last4,
-            "mfc_name": mfc_name,
-            "delivery_date": row.get("delivery_date"),
-            "expected_value": expected_val,
-            "current_dwh_date": current_dwh_date,
-            "current_dwh_value": row.get("dwh_post_promo_sales_inc_vat"),
-            "variance_pct": row.get("abs_variance_pct"),
-            "accounting_category": row.get("accounting_category"),
-            "note": row.get("note", "")[:100] if pd.notna(row.get("note")) else "",
-        }
-        
-        if key in dwh_lookup:
-            # Find the DWH row with closest value match
-            candidates = dwh_lookup[key]
-            best_match = None
-            best_diff = float("inf")
-            
-            for cand in candidates:
-                diff = abs(cand["post_promo_sales_inc_vat"] - expected_val)
-                if diff < best_diff:
-                    best_diff = diff
-                    best_match = cand
-            
-            if best_match:
-                result["best_match_date"] = best_match["created_at_day"]
-                result["best_match_value"] = best_match["post_promo_sales_inc_vat"]
-                result["best_match_diff"] = best_diff
-                result["best_match_gp_id"] = best_match["gp_order_id"]
-                
-                # Check if best match is from a different date (prior period)
-                if str(best_match["created_at_day"]) != str(current_dwh_date):
-                    result["status"] = "PRIOR_PERIOD_FOUND"
-                    found_prior += 1
-                elif best_diff < expected_val * 0.05:  # Within 5%
-                    result["status"] = "BETTER_MATCH_SAME_DATE"
-                else:
-                    result["status"] = "NO_GOOD_MATCH"
-                    not_found += 1
-            else:
-                result["status"] = "NO_DWH_RECORD"
-                not_found += 1
-        else:
-            result["status"] = "NO_DWH_RECORD"
-            not_found += 1
-        
-        results.append(result)
+    if dwh_index is None:
+        print(f"\n   Building DWH lookup index...")
+        dwh_index = build_dwh_key_index(dwh_df)
+    
+    hv = high_variance.reset_index(drop=True)
+    hv_last4 = hv["order_last4"].astype(str).str.strip() if "order_last4" in hv.columns else pd.Series("", index=hv.index)
+    hv_mfc = hv["mfc_name"].astype(str).str.strip() if "mfc_name" in hv.columns else pd.Series("", index=hv.index)
+    hv_mp = dwh_index["mp_lookup"].get_indexer(hv_last4)
+    hv_loc = dwh_index["loc_lookup"].get_indexer(hv_mfc)
+    
+    # Push the filter down: only DWH rows whose ID and location both occur among the
+    # high-variance rows can ever be candidates (isin over integer codes)
+    mp_codes = dwh_index["mp_codes"]
+    loc_codes = dwh_index["loc_codes"]
+    needed = np.isin(mp_codes, hv_mp[hv_mp >= 0]) & np.isin(loc_codes, hv_loc[hv_loc >= 0])
+    keyed = dwh_index["rows"][needed]
+    mp_codes = mp_codes[needed]
+    loc_codes = loc_codes[needed]
+    
+    # Pack the pair into one int64, (loc_code << 32) | mp_code, and lay the rows out by key:
+    # group g owns key_rows[key_offsets[g]:key_offsets[g + 1]] (DWH row order within each group)
+    key_codes = (loc_codes.astype(np.int64) << 32) | mp_codes.astype(np.int64)
+    group_ids, group_keys = pd.factorize(key_codes)
+    n_keys = len(group_keys)
+    key_rows = np.argsort(group_ids, kind="stable")
+    key_sizes = np.bincount(group_ids, minlength=n_keys)
+    key_offsets = np.concatenate([[0], np.cumsum(key_sizes)])
+    key_index = pd.Index(group_keys)
+    print(f"   DWH lookup keys (for high-variance rows): {n_keys:,}")
+    
+    # Map each variance row to its DWH key group with one hashed lookup (-1 = no DWH record),
+    # then expand to one candidate per (variance row, DWH row in that group) - no merge needed
+    hv_keys = np.where((hv_mp >= 0) & (hv_loc >= 0), (hv_loc.astype(np.int64) << 32) | hv_mp, -1)
+    hv_group = key_index.get_indexer(hv_keys)
+    has_group = hv_group >= 0
+    counts = np.zeros(len(hv), dtype=np.intp)
+    counts[has_group] = key_sizes[hv_group[has_group]]
+    cand_hv = np.repeat(np.arange(len(hv)), counts)
+    within = np.arange(len(cand_hv)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cand_rows = key_rows[key_offsets[hv_group[cand_hv]] + within]
+    
+    # Closest value per variance row (first candidate wins ties); rows without one stay NaN
+    best_cand, best_diff = closest_candidates(
+        cand_hv,
+        as_money(keyed["post_promo_sales_inc_vat"]).to_numpy()[cand_rows],
+        hv["expected_value"].to_numpy(dtype=float),
+    )
+    found = best_cand >= 0
+    best_row = np.full(len(hv), -1, dtype=np.intp)
+    best_row[found] = cand_rows[best_cand[found]]
+    best = (
+        keyed[["gp_order_id", "created_at_day", "post_promo_sales_inc_vat"]]
+        .reset_index(drop=True)
+        .reindex(best_row)
+    )
     
-    results_df = pd.DataFrame(results)
+    def column(name: str, default=None) -> pd.Series:
+        """Return a high-variance column, or a constant Series if it is missing."""
+        return hv[name] if name in hv.columns else pd.Series(default, index=hv.index)
+    
+    notes = column("note")
+    current_dwh_date = column("dwh_created_at_day", "")
+    
+    results_df = pd.DataFrame({
+        "order_number": column("order_number"),
+        "order_last4": hv_last4,
+        "mfc_name": hv_mfc,
+        "delivery_date": column("delivery_date"),
+        "expected_value": hv["expected_value"],
+        "current_dwh_date": current_dwh_date,
+        "current_dwh_value": column("dwh_post_promo_sales_inc_vat"),
+        "variance_pct": column("abs_variance_pct"),
+        "accounting_category": column("accounting_category"),
+        "note": notes.astype(str).str[:100].where(notes.notna(), ""),
+        "best_match_date": best["created_at_day"].to_numpy(),
+        "best_match_value": best["post_promo_sales_inc_vat"].to_numpy(),
+        "best_match_diff": best_diff,
+        "best_match_gp_id": best["gp_order_id"].to_numpy(),
+    })
+    
+    # Prior period = best match on a different date; otherwise better match if within 5%
+    results_df["status"] = np.select(
+        [
+            np.isnan(best_diff),
+            (best["created_at_day"].astype(str).to_numpy() != current_dwh_date.astype(str).to_numpy()),
+            best_diff < results_df["expected_value"].to_numpy() * 0.05,
+        ],
+        ["NO_DWH_RECORD", "PRIOR_PERIOD_FOUND", "BETTER_MATCH_SAME_DATE"],
+        default="NO_GOOD_MATCH",
+    )
     
     print(f"\n   --- Prior Period Lookup Results ---")
     if "status" in results_df.columns:
@@ -371,25 +589,47 @@ def show_sample_comparisons(variance_df: pd.DataFrame, n_samples: int = 15) -> N
         print("   No variance rows to sample.")
         return
     
-    sample = variance_df.sample(n=min(n_samples, len(variance_df)), random_state=42)
+    # Pick row positions first, then take only the columns the printout reads
+    # (missing columns get their display default)
+    printed_defaults = {
+        "order_number": "N/A", "order_last4": "N/A", "mfc_name": "N/A",
+        "delivery_date": "N/A", "dwh_created_at_day": "N/A",
+        "order_value_gross": 0, "marketing_offer_discount": 0, "dwh_post_promo_sales_inc_vat": 0,
+        "accounting_category": "N/A", "note": None,
+    }
+    rng = np.random.default_rng(42)
+    chosen = rng.choice(len(variance_df), size=min(n_samples, len(variance_df)), replace=False)
+    sample = (
+        variance_df.iloc[chosen][[c for c in printed_defaults if c in variance_df.columns]]
+        .assign(**{c: d for c, d in printed_defaults.items() if c not in variance_df.columns})
+    )
     
-    for idx, (_, row) in enumerate(sample.iterrows(), 1):
-        order_num = row.get("order_number", "N/A")
-        last4 = row.get("order_last4", "N/A")
-        mfc = row.get("mfc_name", "N/A")
-        dr_date = row.get("delivery_date", "N/A")
-        dwh_date = row.get("dwh_created_at_day", "N/A")
-        
-        dr_val = row.get("order_value_gross", 0) or 0
-        discount = row.get("marketing_offer_discount", 0) or 0
-        expected = dr_val + discount
-        dwh_val = row.get("dwh_post_promo_sales_inc_vat", 0) or 0
-        variance = expected - dwh_val
-        var_pct = (variance / dwh_val * 100) if dwh_val else 0
-        
-        category = row.get("accounting_category", "N/A")
-        note = str(row.get("note", ""))[:60] if pd.notna(row.get("note")) else ""
-        
+    # All arithmetic for the sample in one vectorised pass
+    dr_val = as_money(sample["order_value_gross"]).fillna(0)
+    discount = as_money(sample["marketing_offer_discount"]).fillna(0)
+    dwh_val = as_money(sample["dwh_post_promo_sales_inc_vat"]).fillna(0)
+    expected = dr_val + discount
+    variance = expected - dwh_val
+    sample = sample.assign(
+        order_value_gross=dr_val,
+        marketing_offer_discount=discount,
+        dwh_post_promo_sales_inc_vat=dwh_val,
+        expected=expected,
+        variance=variance,
+        var_pct=(variance / dwh_val.replace(0, np.nan) * 100).fillna(0),
+        note=sample["note"].astype(str).str[:60].where(sample["note"].notna(), ""),
+    )
+    
+    rows = sample[[
+        "order_number", "order_last4", "mfc_name", "delivery_date", "dwh_created_at_day",
+        "order_value_gross", "marketing_offer_discount", "expected", "dwh_post_promo_sales_inc_vat",
+        "variance", "var_pct", "accounting_category", "note",
+    ]].itertuples(index=False, name=None)
+    
+    for idx, (
+        order_num, last4, mfc, dr_date, dwh_date,
+        dr_val, discount, expected, dwh_val, variance, var_pct, category, note,
+    ) in enumerate(rows, 1):
         print(f"\n   [{idx}] Order: {order_num} | Last4: {last4} | MFC: {mfc}")
         print(f"       DR Date: {dr_date} | DWH Date: {dwh_date}")
         print(f"       Category: {category}")
@@ -422,7 +662,7 @@ def analyse_adjustments(recon_df: pd.DataFrame) -> None:
     for cat in adjustment_categories:
         count = (adjustments["accounting_category"] == cat).sum()
         if count > 0:
-            total = adjustments[adjustments["accounting_category"] == cat]["total_payable"].sum()
+            total = as_money(adjustments[adjustments["accounting_category"] == cat]["total_payable"]).sum()
             print(f"   {cat}: {count:,} rows | £{total:,.2f}")
     
     # Check which have order numbers (can be linked to original orders)
@@ -437,8 +677,10 @@ def analyse_adjustments(recon_df: pd.DataFrame) -> None:
     if len(has_order) > 0:
         print(f"\n   --- Sample Adjustments with Order Numbers ---")
         sample = has_order.head(5)
-        for _, row in sample.iterrows():
-            print(f"   Order: {row['order_number']} | {row['accounting_category']} | £{row['total_payable']:.2f}")
+        for order_num, category, payable in sample[
+            ["order_number", "accounting_category", "total_payable"]
+        ].itertuples(index=False, name=None):
+            print(f"   Order: {order_num} | {category} | £{payable:.2f}")
 
 
 # ====================================================================================================
@@ -516,6 +758,7 @@ def main() -> None:
     recon_df = load_reconciliation(CONFIG["reconciliation_file"])
     combined_df = load_combined(CONFIG["combined_file"])
     dwh_df = load_dwh(CONFIG["dwh_folder"])
+    dwh_index = build_dwh_key_index(dwh_df)
     
     # Run analyses
     variance_df = analyse_variance_summary(recon_df)
@@ -526,7 +769,8 @@ def main() -> None:
         prior_lookup_df = lookup_prior_period_orders(
             variance_df, 
             dwh_df, 
-            threshold_pct=CONFIG["variance_threshold_pct"]
+            threshold_pct=CONFIG["variance_threshold_pct"],
+            dwh_index=dwh_index,
         )
     
     show_sample_comparisons(variance_df, n_samples=CONFIG["sample_size"])
@@ -543,6 +787,7 @@ def main() -> None:
         "variance_df": variance_df,
         "prior_lookup_df": prior_lookup_df,
         "dwh_df": dwh_df,
+        "dwh_index": dwh_index,
     }
 
 
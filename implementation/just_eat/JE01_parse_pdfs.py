@@ -136,6 +136,16 @@ def rename_je_raw_pdfs(pdf_folder: Path, log_callback: Callable[[str], None] | N
 # 4. PDF TEXT EXTRACTION HELPERS
 # ====================================================================================================
 
+DASH_TRANSLATION = str.maketrans({"–": "-"})
+MONEY_AMOUNT_RE = re.compile(r"([\-]?)\s*£\s*([0-9]{1,3}(?:,[0-9]{3})*\.[0-9]{2})")
+MONEY_TEXT_RE = re.compile(r"[–\-]?\s*£\s*[0-9]{1,3}(?:,[0-9]{3})*\.[0-9]{2}")
+
+COMP_QUERY_RE = re.compile(r"Customer compensation for (.*?) query (\d+)", re.I)
+CANCELLED_ORDER_RE = re.compile(r"Restaurant\s+Comp\s*[-–]?\s*Cancelled\s+Order\s*[-–\s]*?(\d+)", re.I)
+RECOOK_RE = re.compile(r"Order\s*ID[:\s]*([0-9]+)\s*[-–]\s*Partner\s+Compensation\s+Recook", re.I)
+COMP_CREDIT_RE = re.compile(r"Order\s*ID[:\s]*(\d+)\s*[-–]\s*Customer\s+Compensation\s+Credit", re.I)
+
+
 def get_segment_text(pdf_path: Path) -> str:
     """
     Description:
@@ -187,31 +197,28 @@ def extract_descriptions(segment_text: str) -> List[str]:
     if not segment_text:
         return []
 
-    lines = [re.sub(r"\s+", " ", ln).strip() for ln in segment_text.splitlines()]
-    lines = [ln for ln in lines if ln]
+    lines = pd.Series(segment_text.splitlines(), dtype=object)
+    lines = lines.str.replace(r"\s+", " ", regex=True).str.strip()
 
-    money_re = re.compile(r"[–\-]?\s*£\s*[0-9]{1,3}(?:,[0-9]{3})*\.[0-9]{2}")
-    lines = [money_re.sub("", ln).strip() for ln in lines if not money_re.fullmatch(ln)]
+    # One pass strips amounts; lines left empty (blank or amounts only) are dropped
+    lines = lines.str.replace(MONEY_TEXT_RE, "", regex=True).str.strip()
+    lines = lines[lines != ""]
+    if lines.empty:
+        return []
 
-    merged = []
-    for ln in lines:
-        if not merged:
-            merged.append(ln)
-            continue
-        # Start new entry if:
-        # - Line begins with uppercase, OR
-        # - Line begins with digit AND has '%' early (e.g., "80% off...") - marketing item
-        # Otherwise merge (handles orphaned order numbers like "749030039 (Outside the scope of VAT)")
-        if ln[0].isupper():
-            merged.append(ln)
-        elif ln[0].isdigit() and '%' in ln[:5]:
-            # Marketing line starting with percentage (e.g., "80% off £15 Offer Rebate")
-            merged.append(ln)
-        else:
-            merged[-1] += " " + ln
+    # Start new entry if:
+    # - Line begins with uppercase, OR
+    # - Line begins with digit AND has '%' early (e.g., "80% off...") - marketing item
+    # Otherwise merge (handles orphaned order numbers like "749030039 (Outside the scope of VAT)")
+    first_char = lines.str[:1]
+    new_entry = first_char.str.isupper() | (
+        first_char.str.isdigit() & lines.str[:5].str.contains("%", regex=False)
+    )
+    new_entry.iloc[0] = True
 
-    merged = [re.sub(r"\s{2,}", " ", s).strip() for s in merged]
-    return [s for s in merged if s]
+    merged = lines.groupby(new_entry.cumsum().to_numpy()).agg(" ".join)
+    merged = merged.str.replace(r"\s{2,}", " ", regex=True).str.strip()
+    return merged[merged != ""].tolist()
 
 
 def extract_amounts(segment_text: str) -> List[float]:
@@ -235,30 +242,24 @@ def extract_amounts(segment_text: str) -> List[float]:
     # Find where Subtotal appears and truncate - we don't want summary amounts
     # But "Subtotal" might appear BEFORE the amounts in the text due to PDF extraction order
     # So we look for the pattern of summary amounts instead
-    
-    segment_text = (
-        segment_text.replace("–", "-")
-        .replace("- \n£", "-£")
-        .replace("-\n£", "-£")
-    )
 
-    money_pattern = re.compile(
-        r"([\-]?)\s*£\s*([0-9]{1,3}(?:,[0-9]{3})*\.[0-9]{2})"
-    )
-    results = []
-    for m in money_pattern.finditer(segment_text):
-        sign = -1 if m.group(1) == "-" else 1
-        value = float(m.group(2).replace(",", "")) * sign
-        
-        # Skip large positive amounts that are clearly summary values (Subtotal, VAT, Total)
-        # The only large positive amount we want is the Commission (first item)
-        # Refund items are small (typically < £50) and negative credits are also small
-        if len(results) > 0 and value > 1000:
-            # This is likely a summary amount - stop here
-            break
-            
-        results.append(value)
-    return results
+    # En dashes become minus signs; "-\n£" breaks need no rewrite as the pattern spans whitespace
+    matches = MONEY_AMOUNT_RE.findall(segment_text.translate(DASH_TRANSLATION))
+    if not matches:
+        return []
+
+    found = np.array(matches)
+    values = np.char.replace(found[:, 1], ",", "").astype(np.float64)
+    values = np.where(found[:, 0] == "-", -values, values)
+
+    # Skip large positive amounts that are clearly summary values (Subtotal, VAT, Total)
+    # The only large positive amount we want is the Commission (first item)
+    # Refund items are small (typically < £50) and negative credits are also small
+    summary_idx = np.flatnonzero(values[1:] > 1000)
+    if len(summary_idx):
+        values = values[: summary_idx[0] + 1]
+
+    return values.tolist()
 
 
 def parse_reason_and_order(desc: str) -> Tuple[str, str]:
@@ -280,32 +281,22 @@ def parse_reason_and_order(desc: str) -> Tuple[str, str]:
         4. "Order ID: {order_id} - Customer Compensation Credit" - Credits (refunds to restaurant)
     """
     # Pattern 1: Customer compensation for X query 123456 (debits)
-    m1 = re.search(r"Customer compensation for (.*?) query (\d+)", desc, re.I)
+    m1 = COMP_QUERY_RE.search(desc)
     if m1:
         return m1.group(1).strip(), m1.group(2).strip()
 
     # Pattern 2: Restaurant comp – cancelled order – 123456
-    m2 = re.search(
-        r"Restaurant\s+Comp\s*[-–]?\s*Cancelled\s+Order\s*[-–\s]*?(\d+)", desc, re.I
-    )
+    m2 = CANCELLED_ORDER_RE.search(desc)
     if m2:
         return "Restaurant Comp - Cancelled Order", m2.group(1).strip()
 
     # Pattern 3: Order ID: 123456 - Partner Compensation Recook
-    m3 = re.search(
-        r"Order\s*ID[:\s]*([0-9]+)\s*[-–]\s*Partner\s+Compensation\s+Recook",
-        desc,
-        re.I,
-    )
+    m3 = RECOOK_RE.search(desc)
     if m3:
         return "Partner Compensation Recook", m3.group(1).strip()
 
     # Pattern 4: Order ID: 123456 - Customer Compensation Credit (credits)
-    m4 = re.search(
-        r"Order\s*ID[:\s]*(\d+)\s*[-–]\s*Customer\s+Compensation\s+Credit",
-        desc,
-        re.I,
-    )
+    m4 = COMP_CREDIT_RE.search(desc)
     if m4:
         return "Customer Compensation Credit", m4.group(1).strip()
 
@@ -325,25 +316,26 @@ def build_refund_dataframe(descriptions: List[str], amounts: List[float]) -> pd.
         pd.DataFrame: DataFrame with description, amount, reason, order_number, outside_scope.
     """
     n = min(len(descriptions), len(amounts))
-    rows = []
-    for i in range(n):
-        desc = descriptions[i]
-        amt = amounts[i]
-        reason, order = parse_reason_and_order(desc)
-        rows.append({
-            "description": desc,
-            "amount": amt,
-            "reason": reason,
-            "order_number": order,
-            "outside_scope": "Outside the scope of VAT" in desc,
-        })
-    return pd.DataFrame(rows)
+    desc = descriptions[:n]
+    parsed = [parse_reason_and_order(d) for d in desc]
+
+    # Assembled from typed column arrays: no per-row dicts and no dtype inference pass
+    return pd.DataFrame({
+        "description": np.array(desc, dtype=object),
+        "amount": np.array(amounts[:n], dtype=np.float64),
+        "reason": np.array([reason for reason, _ in parsed], dtype=object),
+        "order_number": np.array([order for _, order in parsed], dtype=object),
+        "outside_scope": np.array(["Outside the scope of VAT" in d for d in desc], dtype=bool),
+    }, copy=False)
 
 
 # ====================================================================================================
 # 5. DATE PARSING HELPERS
 # ====================================================================================================
 
+FILENAME_DATE_RE = re.compile(r"(\d{2})\.(\d{2})\.(\d{2})")
+
+
 def extract_date_from_filename(filename: str) -> date | None:
     """
     Description:
@@ -355,7 +347,7 @@ def extract_date_from_filename(filename: str) -> date | None:
     Returns:
         date | None: The Monday date, or None if not found.
     """
-    m = re.search(r"(\d{2})\.(\d{2})\.(\d{2})", filename)
+    m = FILENAME_DATE_RE.search(filename)
     if not m:
         return None
     try:
@@ -370,6 +362,27 @@ def extract_date_from_filename(filename: str) -> date | None:
 # 6. SINGLE PDF PROCESSOR
 # ====================================================================================================
 
+# Compiled once at import; process_single_pdf runs per PDF in the batch loop
+PERIOD_PATTERNS = [
+    re.compile(
+        r"(\d{1,2}\s+[A-Za-z]{3,}\s+\d{4})\s*[-–to]+\s*(\d{1,2}\s+[A-Za-z]{3,}\s+\d{4})",
+        re.I,
+    ),
+    re.compile(
+        r"(\d{1,2}/\d{1,2}/\d{2,4})\s*[-–to]+\s*(\d{1,2}/\d{1,2}/\d{2,4})",
+        re.I,
+    ),
+]
+ORDERS_COUNT_RE = re.compile(r"Number\s+of\s+orders\s+([\d,]+)", re.I)
+TOTAL_SALES_RE = re.compile(r"Total\s+sales.*?£\s*([\d,]+\.\d{2})", re.I | re.S)
+YOU_RECEIVE_RE = re.compile(r"You\s+will\s+receive.*?£\s*([\d,]+\.\d{2})", re.I | re.S)
+PAYMENT_DATE_RE = re.compile(r"paid\s+on\s+(\d{1,2}\s+[A-Za-z]{3,}\s+\d{4})", re.I)
+ORDER_LINE_RE = re.compile(
+    r"^\s*\d+\s+(\d{2}/\d{2}/\d{2})\s+(\d+)\s+([A-Za-z/&\-]+)\s+(.*)$", re.M
+)
+ORDER_LINE_MONEY_RE = re.compile(r"[£]\s*([\d.,]+)")
+
+
 def process_single_pdf(
     pdf_path: Path,
     refund_folder: Path | None = None,
@@ -407,19 +420,9 @@ def process_single_pdf(
         return None
 
     # 2) Detect statement period from PDF header
-    period_patterns = [
-        re.compile(
-            r"(\d{1,2}\s+[A-Za-z]{3,}\s+\d{4})\s*[-–to]+\s*(\d{1,2}\s+[A-Za-z]{3,}\s+\d{4})",
-            re.I,
-        ),
-        re.compile(
-            r"(\d{1,2}/\d{1,2}/\d{2,4})\s*[-–to]+\s*(\d{1,2}/\d{1,2}/\d{2,4})",
-            re.I,
-        ),
-    ]
     m_period = None
     for page_text in full_text_pages:
-        for pat in period_patterns:
+        for pat in PERIOD_PATTERNS:
             m_period = pat.search(page_text)
             if m_period:
                 break
@@ -434,15 +437,10 @@ def process_single_pdf(
         return None
 
     # 3) Extract header-level numbers for validation
-    orders_count_pat = re.compile(r"Number\s+of\s+orders\s+([\d,]+)", re.I)
-    total_sales_pat = re.compile(r"Total\s+sales.*?£\s*([\d,]+\.\d{2})", re.I | re.S)
-    you_receive_pat = re.compile(r"You\s+will\s+receive.*?£\s*([\d,]+\.\d{2})", re.I | re.S)
-    payment_date_pat = re.compile(r"paid\s+on\s+(\d{1,2}\s+[A-Za-z]{3,}\s+\d{4})", re.I)
-
-    m_orders = orders_count_pat.search(full_text)
-    m_sales = total_sales_pat.search(full_text)
-    m_recv = you_receive_pat.search(full_text)
-    m_payment = payment_date_pat.search(full_text)
+    m_orders = ORDERS_COUNT_RE.search(full_text)
+    m_sales = TOTAL_SALES_RE.search(full_text)
+    m_recv = YOU_RECEIVE_RE.search(full_text)
+    m_payment = PAYMENT_DATE_RE.search(full_text)
 
     reported_order_count = int(m_orders.group(1).replace(",", "")) if m_orders else None
     reported_total_sales = float(m_sales.group(1).replace(",", "")) if m_sales else None
@@ -450,15 +448,10 @@ def process_single_pdf(
     payment_date = try_parse_date(m_payment.group(1) if m_payment else None)
 
     # 4) Extract order lines
-    line_prefix = re.compile(
-        r"^\s*\d+\s+(\d{2}/\d{2}/\d{2})\s+(\d+)\s+([A-Za-z/&\-]+)\s+(.*)$", re.M
-    )
-    money_finder = re.compile(r"[£]\s*([\d.,]+)")
-
     orders_data = []
-    for m in line_prefix.finditer(full_text):
+    for m in ORDER_LINE_RE.finditer(full_text):
         date_str, order_id, order_type, tail = m.groups()
-        amts = money_finder.findall(tail)
+        amts = ORDER_LINE_MONEY_RE.findall(tail)
         if not amts:
             continue
         total = float(amts[-1].replace(",", ""))
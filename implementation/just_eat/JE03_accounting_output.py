@@ -77,7 +77,6 @@ logger = get_logger(__name__)
 # --- Additional project-level imports (append below this line only) ---------------------------------
 from core.C07_datetime_utils import format_date, get_end_of_week
 from core.C09_io_utils import read_csv_file, save_dataframe
-from core.C06_validation_utils import file_exists
 
 from implementation.I03_project_static_lists import ACCOUNTING_DF_ORDER
 
@@ -176,31 +175,34 @@ def run_je_accounting_output(
     log(f"Accounting Period: {acc_start} -> {acc_end}")
     log(f"Statement Period: {stmt_start} -> {stmt_end_sunday}")
 
-    # 1. Build input filename and check it exists (uses Monday dates)
+    # 1. Build input filename (uses Monday dates)
     recon_filename = build_reconciliation_filename(stmt_start, stmt_end_monday)
     recon_path = output_folder / recon_filename
 
     log(f"Looking for: {recon_filename}")
 
-    if not file_exists(recon_path):
-        log(f"ERROR: Reconciliation file not found: {recon_path}")
-        raise FileNotFoundError(f"Reconciliation file not found: {recon_path}")
-
-    # 2. Load reconciliation CSV
+    # 2. Load reconciliation CSV (read_csv_file raises FileNotFoundError itself, so no separate
+    #    existence check - one less round trip on the shared drive)
     log(f"Loading reconciliation file...")
-    df = read_csv_file(recon_path)
+    try:
+        df = read_csv_file(recon_path)
+    except FileNotFoundError:
+        log(f"ERROR: Reconciliation file not found: {recon_path}")
+        raise FileNotFoundError(f"Reconciliation file not found: {recon_path}") from None
     log(f"Loaded {len(df):,} rows, {len(df.columns)} columns")
 
     # 3. Reorder columns to ACCOUNTING_DF_ORDER
     # Only include columns that exist in both the data and the order list
-    available_columns = [col for col in ACCOUNTING_DF_ORDER if col in df.columns]
-    missing_columns = [col for col in ACCOUNTING_DF_ORDER if col not in df.columns]
+    data_columns = frozenset(df.columns)
+    available_columns = [col for col in ACCOUNTING_DF_ORDER if col in data_columns]
+    missing_columns = [col for col in ACCOUNTING_DF_ORDER if col not in data_columns]
 
     if missing_columns:
         log(f"Note: {len(missing_columns)} columns from ACCOUNTING_DF_ORDER not in data (skipped)")
         logger.debug(f"Missing columns: {missing_columns}")
 
-    df_reordered = df[available_columns].copy()
+    # Column selection already yields a new frame that is only written out, so no extra copy
+    df_reordered = df[available_columns]
     log(f"Reordered to {len(available_columns)} columns (ACCOUNTING_DF_ORDER)")
 
     # 4. Build output filename and save (uses Monday dates)
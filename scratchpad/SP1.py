@@ -6,10 +6,13 @@ return for a specific PDF, and how they're paired in build_refund_dataframe().
 
 Usage:
     python je_debug_trace.py "path/to/pdf.pdf"
+    python je_debug_trace.py "a.pdf" "b.pdf" ...   (batch: one summary line per PDF)
 """
 
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Tuple
 
@@ -17,6 +20,7 @@ from typing import List, Tuple
 import pdfplumber
 from pdfminer.high_level import extract_text as pdfminer_extract_text
 
+import numpy as np
 import pandas as pd
 
 
@@ -24,6 +28,22 @@ import pandas as pd
 # FUNCTIONS (copied from JE01_parse_pdfs.py for standalone use)
 # ============================================================================
 
+DASH_TRANSLATION = str.maketrans({"–": "-"})
+MONEY_AMOUNT_RE = re.compile(r"([\-]?)\s*£\s*([0-9]{1,3}(?:,[0-9]{3})*\.[0-9]{2})")
+MONEY_TEXT_RE = re.compile(r"[–\-]?\s*£\s*[0-9]{1,3}(?:,[0-9]{3})*\.[0-9]{2}")
+
+# Each alternative is a lookahead anchored at the start, so the first reason that appears
+# anywhere in the description wins, in the same priority order as the original if-chain.
+REFUND_REASON_RE = re.compile(
+    r"^(?:"
+    r"(?=.*?Customer compensation for (?P<comp_reason>.*?) query (?P<comp_order>\d+))"
+    r"|(?=.*?Restaurant\s+Comp\s*[-–]?\s*Cancelled\s+Order\s*[-–\s]*?(?P<cancelled_order>\d+))"
+    r"|(?=.*?Order\s*ID[:\s]*(?P<recook_order>[0-9]+)\s*[-–]\s*Partner\s+Compensation\s+Recook)"
+    r"|(?=.*?Order\s*ID[:\s]*(?P<credit_order>\d+)\s*[-–]\s*Customer\s+Compensation\s+Credit)"
+    r")",
+    re.I | re.S,
+)
+
 def extract_pdf_text(pdf_path: Path) -> str:
     """Extract text using pdfminer."""
     return pdfminer_extract_text(str(pdf_path))
@@ -52,107 +72,83 @@ def extract_descriptions(segment_text: str) -> List[str]:
     if not segment_text:
         return []
 
-    lines = [re.sub(r"\s+", " ", ln).strip() for ln in segment_text.splitlines()]
-    lines = [ln for ln in lines if ln]
-
-    money_re = re.compile(r"[–\-]?\s*£\s*[0-9]{1,3}(?:,[0-9]{3})*\.[0-9]{2}")
-    lines = [money_re.sub("", ln).strip() for ln in lines if not money_re.fullmatch(ln)]
-
-    merged = []
-    for ln in lines:
-        if not merged:
-            merged.append(ln)
-            continue
-        # Start new entry if:
-        # - Line begins with uppercase, OR
-        # - Line begins with digit AND has '%' early (e.g., "80% off...") - marketing item
-        # Otherwise merge (handles orphaned order numbers like "749030039 (Outside the scope of VAT)")
-        if ln[0].isupper():
-            merged.append(ln)
-        elif ln[0].isdigit() and '%' in ln[:5]:
-            # Marketing line starting with percentage (e.g., "80% off £15 Offer Rebate")
-            merged.append(ln)
-        else:
-            merged[-1] += " " + ln
-
-    merged = [re.sub(r"\s{2,}", " ", s).strip() for s in merged]
-    return [s for s in merged if s]
-
+    lines = pd.Series(segment_text.splitlines(), dtype=object)
+    lines = lines.str.replace(r"\s+", " ", regex=True).str.strip()
 
-def extract_amounts(segment_text: str) -> List[float]:
-    """Extract monetary amounts from the commission/refund segment."""
-    if not segment_text:
+    # One pass strips amounts; lines left empty (blank or amounts only) are dropped
+    lines = lines.str.replace(MONEY_TEXT_RE, "", regex=True).str.strip()
+    lines = lines[lines != ""]
+    if lines.empty:
         return []
 
-    segment_text = (
-        segment_text.replace("–", "-")
-        .replace("- \n£", "-£")
-        .replace("-\n£", "-£")
+    first_char = lines.str[:1]
+    new_entry = first_char.str.isupper() | (
+        first_char.str.isdigit() & lines.str[:5].str.contains("%", regex=False)
     )
+    new_entry.iloc[0] = True
 
-    money_pattern = re.compile(
-        r"([\-]?)\s*£\s*([0-9]{1,3}(?:,[0-9]{3})*\.[0-9]{2})"
-    )
-    results = []
-    for m in money_pattern.finditer(segment_text):
-        sign = -1 if m.group(1) == "-" else 1
-        value = float(m.group(2).replace(",", "")) * sign
-        
-        if len(results) > 0 and value > 1000:
-            break
-            
-        results.append(value)
-    return results
+    merged = lines.groupby(new_entry.cumsum().to_numpy()).agg(" ".join)
+    merged = merged.str.replace(r"\s{2,}", " ", regex=True).str.strip()
+    return merged[merged != ""].tolist()
 
 
-def parse_reason_and_order(desc: str) -> Tuple[str, str]:
-    """Extract refund reason and order number from a description."""
-    m1 = re.search(r"Customer compensation for (.*?) query (\d+)", desc, re.I)
-    if m1:
-        return m1.group(1).strip(), m1.group(2).strip()
+def extract_amounts(segment_text: str) -> List[float]:
+    """Extract monetary amounts from the commission/refund segment."""
+    if not segment_text:
+        return []
 
-    m2 = re.search(
-        r"Restaurant\s+Comp\s*[-–]?\s*Cancelled\s+Order\s*[-–\s]*?(\d+)", desc, re.I
-    )
-    if m2:
-        return "Restaurant Comp - Cancelled Order", m2.group(1).strip()
+    matches = MONEY_AMOUNT_RE.findall(segment_text.translate(DASH_TRANSLATION))
+    if not matches:
+        return []
 
-    m3 = re.search(
-        r"Order\s*ID[:\s]*([0-9]+)\s*[-–]\s*Partner\s+Compensation\s+Recook",
-        desc,
-        re.I,
-    )
-    if m3:
-        return "Partner Compensation Recook", m3.group(1).strip()
+    found = np.array(matches)
+    values = np.char.replace(found[:, 1], ",", "").astype(np.float64)
+    values = np.where(found[:, 0] == "-", -values, values)
 
-    m4 = re.search(
-        r"Order\s*ID[:\s]*(\d+)\s*[-–]\s*Customer\s+Compensation\s+Credit",
-        desc,
-        re.I,
-    )
-    if m4:
-        return "Customer Compensation Credit", m4.group(1).strip()
+    summary_idx = np.flatnonzero(values[1:] > 1000)
+    if len(summary_idx):
+        values = values[: summary_idx[0] + 1]
 
-    return "", ""
+    return values.tolist()
 
 
 def build_refund_dataframe(descriptions: List[str], amounts: List[float]) -> pd.DataFrame:
     """Build a DataFrame from descriptions and amounts."""
     n = min(len(descriptions), len(amounts))
-    rows = []
-    for i in range(n):
-        desc = descriptions[i]
-        amt = amounts[i]
-        reason, order = parse_reason_and_order(desc)
-        rows.append({
-            "index": i,
-            "description": desc,
-            "amount": amt,
-            "reason": reason,
-            "order_number": order,
-            "outside_scope": "Outside the scope of VAT" in desc,
-        })
-    return pd.DataFrame(rows)
+    if n == 0:
+        return pd.DataFrame()
+
+    desc = pd.Series(descriptions[:n], dtype=object)
+    parts = desc.str.extract(REFUND_REASON_RE)
+    comp_query = parts["comp_reason"].notna().to_numpy()
+    cancelled = parts["cancelled_order"].notna().to_numpy()
+    recook = parts["recook_order"].notna().to_numpy()
+    credit = parts["credit_order"].notna().to_numpy()
+
+    reason = np.select(
+        [comp_query, cancelled, recook, credit],
+        [
+            parts["comp_reason"].str.strip().to_numpy(),
+            "Restaurant Comp - Cancelled Order",
+            "Partner Compensation Recook",
+            "Customer Compensation Credit",
+        ],
+        default="",
+    )
+    order = np.select(
+        [comp_query, cancelled, recook, credit],
+        [parts[col].to_numpy() for col in ("comp_order", "cancelled_order", "recook_order", "credit_order")],
+        default="",
+    )
+
+    return pd.DataFrame({
+        "index": np.arange(n),
+        "description": desc.to_numpy(),
+        "amount": np.asarray(amounts[:n], dtype=np.float64),
+        "reason": reason,
+        "order_number": order,
+        "outside_scope": desc.str.contains("Outside the scope of VAT", regex=False).to_numpy(),
+    })
 
 
 # ============================================================================
@@ -232,19 +228,22 @@ def run_diagnostic(pdf_path: Path) -> None:
         print("No marketing items found")
     else:
         print(f"Found {len(marketing_df)} marketing item(s):\n")
-        for _, row in marketing_df.iterrows():
-            print(f"  Index: {row['index']}")
-            print(f"  Amount: £{row['amount']:,.2f}")
-            print(f"  Outside Scope: {row['outside_scope']}")
-            print(f"  Description: {row['description']}")
+        for row in marketing_df.itertuples(index=False):
+            print(f"  Index: {row.index}")
+            print(f"  Amount: £{row.amount:,.2f}")
+            print(f"  Outside Scope: {row.outside_scope}")
+            print(f"  Description: {row.description}")
             print()
         
-        # Show the split
-        marketing_vat = marketing_df[~marketing_df["outside_scope"]]
-        marketing_no_vat = marketing_df[marketing_df["outside_scope"]]
+        # Show the split (count and sum per outside_scope value in one grouping pass)
+        split = (
+            marketing_df.groupby("outside_scope")["amount"]
+            .agg(["size", "sum"])
+            .reindex([False, True], fill_value=0)
+        )
         
-        print(f"Marketing WITH VAT (outside_scope=False): {len(marketing_vat)} items, sum = £{marketing_vat['amount'].sum():,.2f}")
-        print(f"Marketing NO VAT (outside_scope=True): {len(marketing_no_vat)} items, sum = £{marketing_no_vat['amount'].sum():,.2f}")
+        print(f"Marketing WITH VAT (outside_scope=False): {split.at[False, 'size']} items, sum = £{split.at[False, 'sum']:,.2f}")
+        print(f"Marketing NO VAT (outside_scope=True): {split.at[True, 'size']} items, sum = £{split.at[True, 'sum']:,.2f}")
     
     # 7) Look for the rebate specifically
     print("\n" + "=" * 80)
@@ -274,11 +273,35 @@ def run_diagnostic(pdf_path: Path) -> None:
                 print(f"  Context: ...{segment[start:end]}...")
 
 
+def parse_one(pdf_path: Path) -> pd.DataFrame:
+    """Parse one PDF into its refund DataFrame (pure, so it can run in a worker process)."""
+    segment = get_segment_text(pdf_path)
+    df = build_refund_dataframe(extract_descriptions(segment), extract_amounts(segment))
+    return df.assign(source_file=pdf_path.name)
+
+
+def run_batch(pdf_paths: List[Path]) -> pd.DataFrame:
+    """Parse many PDFs in parallel (pdfminer is CPU-bound) and print one summary line per PDF."""
+    with ProcessPoolExecutor(max_workers=min(len(pdf_paths), os.cpu_count() or 1)) as executor:
+        frames = list(executor.map(parse_one, pdf_paths))
+
+    for pdf_path, df in zip(pdf_paths, frames):
+        total = df["amount"].sum() if "amount" in df.columns else 0.0
+        print(f"{pdf_path.name}: {len(df)} paired items, sum = £{total:,.2f}")
+    return pd.concat(frames, ignore_index=True)
+
+
 if __name__ == "__main__":
-    pdf_path = Path(r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\05 Just Eat\02 PDFs\01 To Process\25.10.27 - JE Statement.pdf")
+    pdf_paths = [Path(arg) for arg in sys.argv[1:]] or [
+        Path(r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\05 Just Eat\02 PDFs\01 To Process\25.10.27 - JE Statement.pdf")
+    ]
     
-    if not pdf_path.exists():
-        print(f"Error: File not found: {pdf_path}")
+    missing = [p for p in pdf_paths if not p.exists()]
+    if missing:
+        print(f"Error: File not found: {missing[0]}")
         sys.exit(1)
     
-    run_diagnostic(pdf_path)
\ No newline at end of file
+    if len(pdf_paths) == 1:
+        run_diagnostic(pdf_paths[0])
+    else:
+        run_batch(pdf_paths)
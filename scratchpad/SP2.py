@@ -1,7 +1,22 @@
+import numpy as np
 import pandas as pd
 
+# Only the columns used below are parsed, each with a declared dtype. The two day columns are
+# parsed once at load, so the date comparisons below are native datetime64 compares.
+RECON_DATE_COLS = ["delivery_date", "dwh_created_at_day"]
+RECON_DTYPES = {
+    "order_number": str,
+    "mfc_name": "category",
+    "order_category": "category",
+    "matched_amount": "category",
+    "order_value_gross": "float64",
+    "marketing_offer_discount": "float64",
+    "dwh_post_promo_sales_inc_vat": "float64",
+    "amount_variance": "float64",
+}
+
 # Add to SP1.py or run ad-hoc
-df = pd.read_csv(r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\04 Deliveroo\04 Consolidated Output\25.12.01 - 26.01.04 - Deliveroo Reconciliation.csv", low_memory=False)
+df = pd.read_csv(r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\04 Deliveroo\04 Consolidated Output\25.12.01 - 26.01.04 - Deliveroo Reconciliation.csv", usecols=list(RECON_DTYPES) + RECON_DATE_COLS, dtype=RECON_DTYPES, parse_dates=RECON_DATE_COLS)
 
 # Filter to matched deliveries with variance
 variance_rows = df[(df["order_category"] == "Matched") & (df["matched_amount"] == "Value Variance")]
@@ -9,15 +24,24 @@ variance_rows = df[(df["order_category"] == "Matched") & (df["matched_amount"] =
 print(f"Total variance rows: {len(variance_rows)}")
 
 # Variance magnitude breakdown
-variance_rows["abs_variance"] = variance_rows["amount_variance"].abs()
-variance_rows["abs_variance_pct"] = (variance_rows["abs_variance"] / variance_rows["dwh_post_promo_sales_inc_vat"] * 100)
+# Both columns come from ufuncs writing into arrays allocated once, then one assign (no chained-assignment copy)
+abs_variance = np.abs(variance_rows["amount_variance"].to_numpy(dtype="float64"))
+abs_variance_pct = np.empty_like(abs_variance)
+with np.errstate(divide="ignore", invalid="ignore"):  # zero DWH value -> inf/NaN, as Series division gives
+    np.divide(abs_variance, variance_rows["dwh_post_promo_sales_inc_vat"].to_numpy(dtype="float64"), out=abs_variance_pct)
+np.multiply(abs_variance_pct, 100, out=abs_variance_pct)
+variance_rows = variance_rows.assign(abs_variance=abs_variance, abs_variance_pct=abs_variance_pct)
 
 print(f"\nVariance magnitude breakdown:")
-print(f"  < 1%:    {(variance_rows['abs_variance_pct'] < 1).sum()}")
-print(f"  1-5%:    {((variance_rows['abs_variance_pct'] >= 1) & (variance_rows['abs_variance_pct'] < 5)).sum()}")
-print(f"  5-20%:   {((variance_rows['abs_variance_pct'] >= 5) & (variance_rows['abs_variance_pct'] < 20)).sum()}")
-print(f"  20-50%:  {((variance_rows['abs_variance_pct'] >= 20) & (variance_rows['abs_variance_pct'] < 50)).sum()}")
-print(f"  > 50%:   {(variance_rows['abs_variance_pct'] >= 50).sum()}")
+# An infinite % (zero DWH value) is clipped to the largest float so it lands in "> 50%", as a >= 50 test counts it
+buckets = pd.cut(
+    np.minimum(variance_rows["abs_variance_pct"], np.finfo(float).max),
+    bins=[-np.inf, 1, 5, 20, 50, np.inf],
+    labels=["< 1%", "1-5%", "5-20%", "20-50%", "> 50%"],
+    right=False,
+).value_counts(sort=False)
+for label, count in buckets.items():
+    print(f"  {label + ':':<9}{count}")
 
 # Check if dates match exactly or within ±1 day
 print(f"\nDate match analysis:")
@@ -2,11 +2,23 @@ import pandas as pd
 from pathlib import Path
 
 # Load DWH data
+# Only the columns inspected below are parsed, which keeps the per-file frames and the concat copy small.
+# The DWH export is multi-vendor (Uber/Amazon/PayPal IDs are not numeric), so the IDs are read as strings.
+DWH_DTYPES = {
+    "gp_order_id": "string",
+    "mp_order_id": "string",
+    "location_name": "category",
+    "created_at_day": str,
+    "created_at_timestamp": str,
+    "post_promo_sales_inc_vat": "float64",
+}
 dwh_files = list(Path(r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\04 Deliveroo\03 DWH").glob("*.csv"))
-dwh_df = pd.concat([pd.read_csv(f, low_memory=False) for f in dwh_files])
+dwh_df = pd.concat((pd.read_csv(f, usecols=list(DWH_DTYPES), dtype=DWH_DTYPES) for f in dwh_files), ignore_index=True)
+mp_order_num = pd.to_numeric(dwh_df["mp_order_id"], errors="coerce")  # non-numeric IDs become NaN
 
 # Load Deliveroo data
-dr_df = pd.read_csv(r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\04 Deliveroo\04 Consolidated Output\25.12.01 - 26.01.04 - Deliveroo Combined.csv", low_memory=False)
+DR_DTYPES = {"order_number": "Int64", "delivery_datetime_utc": str, "mfc_name": "category", "order_value_gross": "float64", "marketing_offer_discount": "float64"}
+dr_df = pd.read_csv(r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\04 Deliveroo\04 Consolidated Output\25.12.01 - 26.01.04 - Deliveroo Combined.csv", usecols=list(DR_DTYPES), dtype=DR_DTYPES)
 
 # Check timestamp for the problematic Deliveroo order
 print("Deliveroo order 50405289095 details:")
@@ -28,10 +40,10 @@ print(close_value[["gp_order_id", "mp_order_id", "created_at_day", "created_at_t
 
 # Check if any have mp_order_id = 9095
 print(f"\nOf those, with mp_order_id ending in 9095:")
-close_value_9095 = close_value[close_value["mp_order_id"] == 9095]
+close_value_9095 = close_value[mp_order_num[close_value.index] == 9095]
 print(close_value_9095[["gp_order_id", "mp_order_id", "created_at_day", "post_promo_sales_inc_vat"]].to_string())
 
 # Also search all DWH for mp_order_id = 9095 to see all instances
 print(f"\nAll DWH rows with mp_order_id = 9095:")
-all_9095 = dwh_df[dwh_df["mp_order_id"] == 9095]
+all_9095 = dwh_df[mp_order_num == 9095]
 print(all_9095[["gp_order_id", "mp_order_id", "location_name", "created_at_day", "post_promo_sales_inc_vat"]].to_string())
\ No newline at end of file
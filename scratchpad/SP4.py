@@ -2,18 +2,18 @@ import pandas as pd
 
 # Check if multiple Deliveroo orders share the same key
 dr_file = r"H:\Shared drives\Automation Projects\Accounting\Orders to Cash\04 Deliveroo\04 Consolidated Output\25.12.01 - 26.01.04 - Deliveroo Reconciliation.csv"
-dr_df = pd.read_csv(dr_file, low_memory=False)
+DR_DTYPES = {"order_number": "Int64", "mfc_name": "category", "accounting_category": "category"}
+dr_df = pd.read_csv(dr_file, dtype=DR_DTYPES, parse_dates=["delivery_datetime_utc"], low_memory=False)
 
-# Create match key
-dr_df["order_last4"] = dr_df["order_number"].astype(str).str[-4:]
-dr_df["delivery_date"] = pd.to_datetime(dr_df["delivery_datetime_utc"]).dt.date.astype(str)
-dr_df["match_key"] = dr_df["order_last4"] + "|" + dr_df["mfc_name"] + "|" + dr_df["delivery_date"]
+# Match key columns (order_number is integer, so the last four digits are a modulo, not a string slice)
+dr_df["order_last4"] = (dr_df["order_number"] % 10000).astype("Int32")
+dr_df["delivery_date"] = dr_df["delivery_datetime_utc"].values.astype("datetime64[D]")  # day truncation, no date objects
+MATCH_KEY_COLS = ["order_last4", "mfc_name", "delivery_date"]
 
-# Check duplicates
-dr_duplicates = dr_df.groupby("match_key").size().reset_index(name="count")
-dr_duplicates = dr_duplicates[dr_duplicates["count"] > 1]
+# Check duplicates on the key columns directly (rows without an MFC never form a key)
+dup_rows = dr_df[dr_df.duplicated(subset=MATCH_KEY_COLS, keep=False) & dr_df["mfc_name"].notna()]
 
-print(f"Duplicate keys in Deliveroo data: {len(dr_duplicates)}")
+print(f"Duplicate keys in Deliveroo data: {len(dup_rows.drop_duplicates(subset=MATCH_KEY_COLS))}")
 
 # Check specific problematic order
 print(f"\nLooking up order 50405289095:")
@@ -21,7 +21,7 @@ print(dr_df[dr_df["order_number"] == 50405289095][["order_number", "order_last4"
 
 # Check if there are other 9095 orders at same location/date
 print(f"\nAll 9095 orders at LHR_London_1291 on 2025-12-01:")
-mask = (dr_df["order_last4"] == "9095") & (dr_df["mfc_name"] == "LHR_London_1291") & (dr_df["delivery_date"] == "2025-12-01")
+mask = (dr_df["order_last4"] == 9095) & (dr_df["mfc_name"] == "LHR_London_1291") & (dr_df["delivery_date"] == "2025-12-01")
 print(dr_df[mask][["order_number", "order_value_gross", "marketing_offer_discount"]].to_string())
 
 # Check what's in those duplicate rows
@@ -31,6 +31,4 @@ print(dr_df[dr_df["order_number"] == 50405289095][[c for c in cols if c in dr_df
 
 # Check the overall pattern of duplicates
 print("\n\nAccounting category breakdown for duplicate orders:")
-dup_keys = dr_duplicates["match_key"].tolist()
-dup_rows = dr_df[dr_df["match_key"].isin(dup_keys)]
-print(dup_rows["accounting_category"].value_counts())
\ No newline at end of file
+print(dup_rows["accounting_category"].value_counts().loc[lambda counts: counts > 0])  # skip unused categories
\ No newline at end of file
@@ -23,17 +23,63 @@
 # 1. IMPORTS
 # ====================================================================================================
 from __future__ import annotations
+import importlib.util
+import io
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 import numpy as np
 from datetime import date
 
 
+# pyarrow's multithreaded CSV parser is used when installed (it is not a project requirement)
+CSV_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+# Deliveroo-side columns the diagnostics read; every dwh_* column is read as well (field availability)
+REQUIRED_COLS = [
+    "order_number", "order_last4", "mfc_name", "delivery_date", "order_value_gross",
+    "commission_gross", "matched_amount", "order_category",
+]
+
+# Declared dtypes, so these columns skip inference (order IDs are left to it, as they print as read).
+# Labels with a handful of values are categories. Money stays float64: totals print to the penny
+# and the field-availability report only sums float64/int64 columns.
+DTYPES = {
+    "delivery_date": str,
+    "mfc_name": "category",
+    "matched_amount": "category",
+    "order_category": "category",
+    "order_value_gross": "float64",
+    "commission_gross": "float64",
+}
+MONEY_SUFFIXES = ("_inc_vat", "_amount")
+
+# The only columns the variance analysis and sample comparison read, so the Value Variance
+# subset is cut down to these instead of copying every column of the matching rows
+VARIANCE_COLS = [
+    "order_number", "order_last4", "mfc_name", "order_value_gross",
+    "dwh_total_payment_with_tips_inc_vat", "dwh_post_promo_sales_inc_vat", "dwh_delivery_fee_inc_vat",
+    "dwh_priority_fee_inc_vat", "dwh_small_order_fee_inc_vat", "dwh_mp_bag_fee_inc_vat", "dwh_tips_amount",
+    "delivery_date", "dwh_mp_order_id", "dwh_location_name", "dwh_created_at_day", "dwh_total_payment_inc_vat",
+]
+
+
 # ====================================================================================================
 # 2. DIAGNOSTIC FUNCTIONS
 # ====================================================================================================
 
+def label_mask(values: pd.Series, label: str) -> np.ndarray:
+    """Boolean array of values == label, compared on the integer codes when the column is categorical."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        code = values.cat.categories.get_indexer([label])[0]
+        if code < 0:
+            return np.zeros(len(values), dtype=bool)
+        return values.cat.codes.to_numpy() == code
+    return (values == label).to_numpy()
+
+
 def load_reconciliation(filepath: Path) -> pd.DataFrame:
     """Load the reconciliation CSV output from DR02."""
     print(f"\n{'='*70}")
@@ -41,15 +87,22 @@ def load_reconciliation(filepath: Path) -> pd.DataFrame:
     print(f"{'='*70}")
     print(f"File: {filepath.name}")
     
-    df = pd.read_csv(filepath, low_memory=False)
+    header = pd.read_csv(filepath, nrows=0).columns
+    usecols = [c for c in header if c in REQUIRED_COLS or c.startswith("dwh_")]
+    dtypes = {c: DTYPES.get(c, "float64") for c in usecols if c in DTYPES or c.endswith(MONEY_SUFFIXES)}
+    if CSV_ENGINE == "pyarrow":
+        df = pd.read_csv(filepath, engine="pyarrow", usecols=usecols, dtype=dtypes)
+    else:
+        df = pd.read_csv(filepath, low_memory=False, usecols=usecols, dtype=dtypes)
+    
     print(f"Total rows: {len(df):,}")
     print(f"Total columns: {len(df.columns)}")
     
     return df
 
 
-def analyse_value_variance(df: pd.DataFrame) -> None:
-    """Analyse the Value Variance rows to identify patterns."""
+def analyse_value_variance(df: pd.DataFrame, variance_df: pd.DataFrame) -> None:
+    """Analyse the Value Variance rows (variance_df, pre-filtered by main) to identify patterns."""
     print(f"\n{'='*70}")
     print("VALUE VARIANCE ANALYSIS")
     print(f"{'='*70}")
@@ -59,11 +112,8 @@ def analyse_value_variance(df: pd.DataFrame) -> None:
         print("ERROR: matched_amount column not found")
         return
     
-    variance_df = df[df["matched_amount"] == "Value Variance"].copy()
-    exact_df = df[df["matched_amount"] == "Exact Match"].copy()
-    
     print(f"\nValue Variance rows: {len(variance_df):,}")
-    print(f"Exact Match rows: {len(exact_df):,}")
+    print(f"Exact Match rows: {label_mask(df['matched_amount'], 'Exact Match').sum():,}")
     
     if len(variance_df) == 0:
         print("No variance rows to analyse.")
@@ -74,41 +124,47 @@ def analyse_value_variance(df: pd.DataFrame) -> None:
     dwh_col = "dwh_total_payment_with_tips_inc_vat"
     
     if dr_col not in variance_df.columns or dwh_col not in variance_df.columns:
-        print(f"ERROR: Missing columns. Available: {list(variance_df.columns)[:20]}...")
+        print(f"ERROR: Missing columns. Available: {list(df.columns)[:20]}...")
         return
     
-    # Calculate variance statistics
-    variance_df["calc_variance"] = variance_df[dr_col] - variance_df[dwh_col]
-    variance_df["variance_pct"] = (variance_df["calc_variance"] / variance_df[dwh_col] * 100).round(2)
+    # Calculate variance statistics (standalone Series; the shared variance_df is not mutated)
+    calc_variance = variance_df[dr_col] - variance_df[dwh_col]
+    # Unrounded, so the stats and bins use the exact %; rounding happens only in the print formats
+    variance_pct = calc_variance / variance_df[dwh_col] * 100
+    
+    # All summary statistics from one agg call
+    stats = pd.DataFrame({"calc_variance": calc_variance, "variance_pct": variance_pct}).agg({
+        "calc_variance": ["mean", "median", "std", "min", "max"],
+        "variance_pct": ["mean", "median"],  # only these are printed (std of an inf % would warn)
+    })
     
     print(f"\n--- Variance Statistics ---")
-    print(f"Mean variance: £{variance_df['calc_variance'].mean():,.2f}")
-    print(f"Median variance: £{variance_df['calc_variance'].median():,.2f}")
-    print(f"Std deviation: £{variance_df['calc_variance'].std():,.2f}")
-    print(f"Min variance: £{variance_df['calc_variance'].min():,.2f}")
-    print(f"Max variance: £{variance_df['calc_variance'].max():,.2f}")
+    print(f"Mean variance: £{stats.at['mean', 'calc_variance']:,.2f}")
+    print(f"Median variance: £{stats.at['median', 'calc_variance']:,.2f}")
+    print(f"Std deviation: £{stats.at['std', 'calc_variance']:,.2f}")
+    print(f"Min variance: £{stats.at['min', 'calc_variance']:,.2f}")
+    print(f"Max variance: £{stats.at['max', 'calc_variance']:,.2f}")
     
     print(f"\n--- Variance % Statistics ---")
-    print(f"Mean variance %: {variance_df['variance_pct'].mean():.2f}%")
-    print(f"Median variance %: {variance_df['variance_pct'].median():.2f}%")
+    print(f"Mean variance %: {stats.at['mean', 'variance_pct']:.2f}%")
+    print(f"Median variance %: {stats.at['median', 'variance_pct']:.2f}%")
     
     # Distribution of variance percentages
     print(f"\n--- Variance % Distribution ---")
-    bins = [(-np.inf, -10), (-10, -5), (-5, -1), (-1, 1), (1, 5), (5, 10), (10, 20), (20, 50), (50, np.inf)]
-    for low, high in bins:
-        count = ((variance_df["variance_pct"] > low) & (variance_df["variance_pct"] <= high)).sum()
+    # One binning pass over (low, high] intervals; missing % falls outside every bin
+    edges = [-np.inf, -10, -5, -1, 1, 5, 10, 20, 50, np.inf]
+    counts = pd.cut(variance_pct, bins=edges).value_counts(sort=False).to_numpy()
+    for low, high, count in zip(edges[:-1], edges[1:], counts):
         pct = count / len(variance_df) * 100
         print(f"   {low:>6} to {high:<6}: {count:>6,} ({pct:>5.1f}%)")
 
 
-def show_sample_comparisons(df: pd.DataFrame, n_samples: int = 15) -> None:
-    """Show side-by-side comparison of sample variance rows."""
+def show_sample_comparisons(variance_df: pd.DataFrame, n_samples: int = 15) -> None:
+    """Show side-by-side comparison of sample variance rows (variance_df, pre-filtered by main)."""
     print(f"\n{'='*70}")
     print(f"SAMPLE COMPARISONS (n={n_samples})")
     print(f"{'='*70}")
     
-    variance_df = df[df["matched_amount"] == "Value Variance"].copy()
-    
     if len(variance_df) == 0:
         print("No variance rows to sample.")
         return
@@ -136,39 +192,58 @@ def show_sample_comparisons(df: pd.DataFrame, n_samples: int = 15) -> None:
     print(f"\n--- Side-by-Side Sample ---")
     print("-" * 120)
     
-    for idx, (_, row) in enumerate(sample.iterrows(), 1):
-        dr_val = row.get("order_value_gross", 0)
-        dwh_val = row.get("dwh_total_payment_with_tips_inc_vat", 0)
-        variance = dr_val - dwh_val
-        
-        print(f"\n[{idx}] Order: {row.get('order_number', 'N/A')} | Last4: {row.get('order_last4', 'N/A')} | MFC: {row.get('mfc_name', 'N/A')}")
-        print(f"    Deliveroo order_value_gross:         £{dr_val:>10.2f}")
-        print(f"    DWH total_payment_with_tips_inc_vat: £{dwh_val:>10.2f}")
-        print(f"    VARIANCE:                            £{variance:>10.2f} ({variance/dwh_val*100 if dwh_val else 0:.1f}%)")
-        
-        # Show DWH component breakdown if available
-        components = []
-        for col in ["dwh_post_promo_sales_inc_vat", "dwh_delivery_fee_inc_vat", 
-                    "dwh_priority_fee_inc_vat", "dwh_small_order_fee_inc_vat", 
-                    "dwh_mp_bag_fee_inc_vat", "dwh_tips_amount"]:
-            if col in row and pd.notna(row[col]) and row[col] != 0:
-                short_name = col.replace("dwh_", "").replace("_inc_vat", "").replace("_", " ")
-                components.append(f"{short_name}: £{row[col]:.2f}")
-        
-        if components:
-            print(f"    DWH Components: {' | '.join(components)}")
-        
-        # Calculate what DWH total SHOULD be from components
-        calc_total = sum([
-            row.get("dwh_post_promo_sales_inc_vat", 0) or 0,
-            row.get("dwh_delivery_fee_inc_vat", 0) or 0,
-            row.get("dwh_priority_fee_inc_vat", 0) or 0,
-            row.get("dwh_small_order_fee_inc_vat", 0) or 0,
-            row.get("dwh_mp_bag_fee_inc_vat", 0) or 0,
-            row.get("dwh_tips_amount", 0) or 0,
-        ])
-        if calc_total > 0:
-            print(f"    DWH Calculated Total (components):   £{calc_total:>10.2f}")
+    def column(name: str, default) -> np.ndarray:
+        """Whole sample column as an array, or the default repeated if the column is missing."""
+        return sample[name].to_numpy() if name in sample.columns else np.full(len(sample), default, dtype=object)
+    
+    # All arithmetic is done column-wise up front, then the sample prints as one table
+    dr_vals = column("order_value_gross", 0).astype(float)
+    dwh_vals = column("dwh_total_payment_with_tips_inc_vat", 0).astype(float)
+    variances = dr_vals - dwh_vals
+    with np.errstate(divide="ignore", invalid="ignore"):
+        variance_pcts = np.where(dwh_vals != 0, variances / dwh_vals * 100, 0.0)
+    
+    # DWH component breakdown: only non-zero, non-missing components are listed
+    component_cols = [c for c in ["dwh_post_promo_sales_inc_vat", "dwh_delivery_fee_inc_vat", 
+                                  "dwh_priority_fee_inc_vat", "dwh_small_order_fee_inc_vat", 
+                                  "dwh_mp_bag_fee_inc_vat", "dwh_tips_amount"] if c in sample.columns]
+    short_names = [c.replace("dwh_", "").replace("_inc_vat", "").replace("_", " ") for c in component_cols]
+    component_vals = sample[component_cols].to_numpy(dtype=float)
+    component_shown = ~np.isnan(component_vals) & (component_vals != 0)
+    
+    # What the DWH total SHOULD be from components (a missing component leaves the total unknown)
+    calc_totals = component_vals.sum(axis=1)
+    
+    # Only each row's listed components need a per-row join; every other column is formatted whole.
+    # Padded so the text lines up on the left; the calculated total is only shown when positive.
+    components = pd.Series([
+        " | ".join(f"{short_names[j]}: £{component_vals[i, j]:.2f}" for j in np.flatnonzero(component_shown[i]))
+        for i in range(len(sample))
+    ])
+    calc_total_text = pd.Series(calc_totals).map("£{:.2f}".format).where(calc_totals > 0, "")
+    
+    display = pd.DataFrame({
+        "#": np.arange(1, len(sample) + 1),
+        "Order": column("order_number", "N/A"),
+        "Last4": column("order_last4", "N/A"),
+        "MFC": column("mfc_name", "N/A"),
+        "DR Gross": dr_vals,
+        "DWH Total": dwh_vals,
+        "Variance": variances,
+        "Var %": variance_pcts,
+        "DWH Calc Total": calc_total_text.to_numpy(),
+        "DWH Components": components.str.ljust(components.str.len().max()).to_numpy(),
+    })
+    money = "£{:.2f}".format
+    print(display.to_string(
+        index=False,
+        justify="left",
+        formatters={
+            "Order": str, "Last4": str, "MFC": str,
+            "DR Gross": money, "DWH Total": money, "Variance": money,
+            "Var %": "{:.1f}%".format,
+        },
+    ))
 
 
 def check_collision_risk(df: pd.DataFrame) -> None:
@@ -183,105 +258,130 @@ def check_collision_risk(df: pd.DataFrame) -> None:
     
     # Check how many unique full order numbers share the same last4+mfc combo
     if "order_number" in df.columns:
-        combo_df = df[["order_number", "order_last4", "mfc_name", "delivery_date"]].copy()
-        combo_df["combo_key"] = combo_df["order_last4"].astype(str) + "|" + combo_df["mfc_name"].astype(str) + "|" + combo_df["delivery_date"].astype(str)
+        key_cols = ["order_last4", "mfc_name", "delivery_date"]
+        combo_df = df[["order_number"] + key_cols]
         
-        # Count unique order_numbers per combo_key
-        collision_check = combo_df.groupby("combo_key")["order_number"].nunique().reset_index()
-        collision_check.columns = ["combo_key", "unique_orders"]
+        # Factorize each key column once and fold the codes into one int id per (last4, mfc, date),
+        # numbered in first-appearance order. A missing mfc/date is its own value (the old "nan" key).
+        combo_code = np.zeros(len(combo_df), dtype="int64")
+        for col in key_cols:
+            codes, uniques = pd.factorize(combo_df[col], use_na_sentinel=False)
+            combo_code = combo_code * len(uniques) + codes
+        group_id = pd.factorize(combo_code)[0]
         
-        collisions = collision_check[collision_check["unique_orders"] > 1]
+        # Count unique order_numbers per combination with an int-keyed groupby
+        grouped = combo_df["order_number"].groupby(group_id, sort=False)
+        collision_check = grouped.nunique()
+        
+        collisions = collision_check[collision_check > 1]
         
         print(f"\nTotal unique (last4 + mfc + date) combinations: {len(collision_check):,}")
         print(f"Combinations with multiple different order numbers: {len(collisions):,}")
         
         if len(collisions) > 0:
             print(f"\n--- Sample Collisions (up to 10) ---")
-            for _, row in collisions.head(10).iterrows():
-                key = row["combo_key"]
-                matching = combo_df[combo_df["combo_key"] == key]["order_number"].unique()
-                print(f"   Key: {key}")
+            # Only the rows of the first 10 colliding groups are grouped, for their distinct order numbers
+            sample_ids = collisions.index[:10].to_numpy()
+            in_sample = np.isin(group_id, sample_ids)
+            sample_rows = combo_df[in_sample]
+            sample_group = group_id[in_sample]
+            sample_orders = sample_rows["order_number"].groupby(sample_group, sort=False).unique()
+            # Key values are read positionally from each group's first row ("first" would skip NaN);
+            # group ids ascend in first-appearance order, matching the sort=False groupby above
+            first_positions = np.unique(sample_group, return_index=True)[1]
+            sample_keys = sample_rows[key_cols].iloc[first_positions]
+            for key, matching in zip(sample_keys.itertuples(index=False, name=None), sample_orders):
+                print(f"   Key: {'|'.join(map(str, key))}")
                 print(f"   Orders: {list(matching)[:5]}{'...' if len(matching) > 5 else ''}")
 
 
-def analyse_field_definitions(df: pd.DataFrame) -> None:
-    """Analyse what fields might be included/excluded."""
+def analyse_field_definitions(df: pd.DataFrame, matched_idx: np.ndarray) -> None:
+    """Analyse what fields might be included/excluded (matched_idx: positions of the Matched rows)."""
     print(f"\n{'='*70}")
     print("FIELD DEFINITION ANALYSIS")
     print(f"{'='*70}")
     
-    matched_df = df[df["order_category"] == "Matched"].copy()
+    # Plain float arrays for the matched rows - the math below needs no new DataFrame columns
+    n_matched = len(matched_idx)
     
-    if len(matched_df) == 0:
+    if n_matched == 0:
         print("No matched rows to analyse.")
         return
     
+    dr_val = df["order_value_gross"].to_numpy(dtype="float64")[matched_idx]
+    dwh_val = df["dwh_total_payment_with_tips_inc_vat"].to_numpy(dtype="float64")[matched_idx]
+    
     # Check if commission is the difference
-    if "commission_gross" in matched_df.columns:
-        matched_df["dr_minus_commission"] = matched_df["order_value_gross"] - matched_df["commission_gross"]
-        matched_df["diff_from_dwh"] = matched_df["dr_minus_commission"] - matched_df["dwh_total_payment_with_tips_inc_vat"]
-        
-        close_after_commission = (matched_df["diff_from_dwh"].abs() < 0.02).sum()
-        print(f"\nOrders matching DWH after subtracting commission: {close_after_commission:,} ({close_after_commission/len(matched_df)*100:.1f}%)")
+    if "commission_gross" in df.columns:
+        commission = df["commission_gross"].to_numpy(dtype="float64")[matched_idx]
+        close_after_commission = int((np.abs(dr_val - commission - dwh_val) < 0.02).sum())
+        print(f"\nOrders matching DWH after subtracting commission: {close_after_commission:,} ({close_after_commission/n_matched*100:.1f}%)")
     
     # Check relationship between DR and DWH values
     print(f"\n--- Correlation Analysis ---")
     
-    dr_val = matched_df["order_value_gross"]
-    dwh_val = matched_df["dwh_total_payment_with_tips_inc_vat"]
-    
-    if dwh_val.sum() > 0:
-        ratio = dr_val.sum() / dwh_val.sum()
+    dwh_total = np.nansum(dwh_val)
+    if dwh_total > 0:
+        ratio = np.nansum(dr_val) / dwh_total
         print(f"Total DR / Total DWH ratio: {ratio:.4f}")
         print(f"This suggests DR values are ~{(ratio-1)*100:.1f}% {'higher' if ratio > 1 else 'lower'} than DWH")
         
-        # Per-row ratio analysis
-        matched_df["row_ratio"] = dr_val / dwh_val.replace(0, np.nan)
+        # Per-row ratio analysis (zero DWH values give NaN, which the stats skip)
+        row_ratio = pd.Series(np.divide(dr_val, dwh_val, out=np.full_like(dr_val, np.nan), where=dwh_val != 0))
+        ratio_mode = row_ratio.round(2).mode()
         print(f"\nPer-row ratio stats:")
-        print(f"   Mean: {matched_df['row_ratio'].mean():.4f}")
-        print(f"   Median: {matched_df['row_ratio'].median():.4f}")
-        print(f"   Mode (rounded to 2dp): {matched_df['row_ratio'].round(2).mode().values[0] if len(matched_df['row_ratio'].round(2).mode()) > 0 else 'N/A'}")
+        print(f"   Mean: {row_ratio.mean():.4f}")
+        print(f"   Median: {row_ratio.median():.4f}")
+        print(f"   Mode (rounded to 2dp): {ratio_mode.values[0] if len(ratio_mode) > 0 else 'N/A'}")
 
 
-def check_dwh_field_availability(df: pd.DataFrame) -> None:
-    """Check which DWH fields are actually populated."""
+def check_dwh_field_availability(df: pd.DataFrame, matched_idx: np.ndarray) -> None:
+    """Check which DWH fields are actually populated (matched_idx: positions of the Matched rows)."""
     print(f"\n{'='*70}")
     print("DWH FIELD AVAILABILITY")
     print(f"{'='*70}")
     
-    matched_df = df[df["order_category"] == "Matched"].copy()
-    dwh_cols = [c for c in matched_df.columns if c.startswith("dwh_")]
+    dwh_cols = sorted(c for c in df.columns if c.startswith("dwh_"))
     
     print(f"\nDWH columns found: {len(dwh_cols)}")
     print(f"\n--- Population Rates (matched rows) ---")
     
-    for col in sorted(dwh_cols):
-        non_null = matched_df[col].notna().sum()
-        non_zero = (matched_df[col] != 0).sum() if matched_df[col].dtype in ['int64', 'float64'] else non_null
-        pct = non_null / len(matched_df) * 100
-        
-        # Show sum for numeric columns
-        if matched_df[col].dtype in ['int64', 'float64']:
-            total = matched_df[col].sum()
+    # Split the columns by dtype once and reduce each group frame-wide; only numeric columns get a sum
+    dwh_df = df.iloc[matched_idx, df.columns.get_indexer(dwh_cols)]
+    numeric_df = dwh_df.select_dtypes(include="number")
+    other_df = dwh_df.select_dtypes(exclude="number")
+    summary = pd.concat(
+        [
+            pd.concat([numeric_df.notna().sum(), other_df.notna().sum()]).rename("non_null"),
+            numeric_df.sum().rename("total"),
+        ],
+        axis=1,
+    ).loc[dwh_cols]
+    summary["pct"] = summary["non_null"] / len(dwh_df) * 100
+    
+    # The loop below only formats the small summary frame
+    for col, non_null, total, pct in summary.itertuples(name=None):
+        if col in numeric_df.columns:
             print(f"   {col:<45} {non_null:>6,} ({pct:>5.1f}%) | Sum: £{total:>12,.2f}")
         else:
             print(f"   {col:<45} {non_null:>6,} ({pct:>5.1f}%)")
 
 
-def generate_recommendations(df: pd.DataFrame) -> None:
-    """Generate recommendations based on analysis."""
+def generate_recommendations(df: pd.DataFrame, matched_idx: np.ndarray) -> None:
+    """Generate recommendations based on analysis (matched_idx: positions of the Matched rows)."""
     print(f"\n{'='*70}")
     print("RECOMMENDATIONS")
     print(f"{'='*70}")
     
-    matched_df = df[df["order_category"] == "Matched"].copy()
-    
-    if len(matched_df) == 0:
+    if len(matched_idx) == 0:
         print("Insufficient data for recommendations.")
         return
     
-    dr_total = matched_df["order_value_gross"].sum()
-    dwh_total = matched_df["dwh_total_payment_with_tips_inc_vat"].sum()
+    # Every total this section needs, from one take + one column-wise sum
+    total_cols = [c for c in ["order_value_gross", "dwh_total_payment_with_tips_inc_vat", "commission_gross"] if c in df.columns]
+    totals = df.iloc[matched_idx, df.columns.get_indexer(total_cols)].sum()
+    dr_total = totals["order_value_gross"]
+    dwh_total = totals["dwh_total_payment_with_tips_inc_vat"]
     
     print(f"\n1. FIELD MISMATCH CHECK:")
     print(f"   - Deliveroo 'order_value_gross' total: £{dr_total:,.2f}")
@@ -289,8 +389,8 @@ def generate_recommendations(df: pd.DataFrame) -> None:
     print(f"   - Difference: £{dr_total - dwh_total:,.2f} ({(dr_total/dwh_total-1)*100:.1f}%)")
     
     # Check if commission explains it
-    if "commission_gross" in matched_df.columns:
-        commission_total = matched_df["commission_gross"].sum()
+    if "commission_gross" in totals.index:
+        commission_total = totals["commission_gross"]
         print(f"\n   - Total commission (gross): £{commission_total:,.2f}")
         print(f"   - DR minus commission: £{dr_total - commission_total:,.2f}")
         
@@ -309,6 +409,37 @@ def generate_recommendations(df: pd.DataFrame) -> None:
 # 3. MAIN EXECUTION
 # ====================================================================================================
 
+class SectionOutput:
+    """Stand-in for sys.stdout that gives each worker thread its own buffer while installed."""
+    
+    def __init__(self) -> None:
+        self._target = sys.stdout
+        self._local = threading.local()
+    
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (self._target if buffer is None else buffer).write(text)
+    
+    def flush(self) -> None:
+        self._target.flush()
+    
+    def capture(self, fn, *args) -> str:
+        """Run fn(*args) on the calling thread and return everything it printed."""
+        self._local.buffer = io.StringIO()
+        try:
+            fn(*args)
+            return self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+    
+    def __enter__(self) -> SectionOutput:
+        sys.stdout = self
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        sys.stdout = self._target
+
+
 def main(filepath: str | None = None) -> None:
     """Main diagnostic execution."""
     print("\n" + "=" * 70)
@@ -332,12 +463,32 @@ def main(filepath: str | None = None) -> None:
     
     # Run diagnostics
     df = load_reconciliation(csv_path)
-    analyse_value_variance(df)
-    show_sample_comparisons(df, n_samples=15)
-    check_collision_risk(df)
-    analyse_field_definitions(df)
-    check_dwh_field_availability(df)
-    generate_recommendations(df)
+    
+    # The Value Variance rows feed two sections: filter once, taking only the columns they read
+    variance_cols = [c for c in df.columns if c in VARIANCE_COLS]
+    if "matched_amount" in df.columns:
+        variance_df = df.loc[label_mask(df["matched_amount"], "Value Variance"), variance_cols]
+    else:
+        variance_df = df.iloc[:0][variance_cols]
+    
+    # Likewise the Matched rows, used by the last three sections: one compare, kept as positions
+    matched_idx = np.flatnonzero(label_mask(df["order_category"], "Matched"))
+    
+    sections = [
+        (analyse_value_variance, df, variance_df),
+        (show_sample_comparisons, variance_df, 15),
+        (check_collision_risk, df),
+        (analyse_field_definitions, df, matched_idx),
+        (check_dwh_field_availability, df, matched_idx),
+        (generate_recommendations, df, matched_idx),
+    ]
+    
+    # The sections only read df, so they run together on worker threads (the pandas/NumPy
+    # reductions release the GIL). Each prints into its own buffer; reports come out in order.
+    with SectionOutput() as output, ThreadPoolExecutor(max_workers=len(sections)) as pool:
+        futures = [pool.submit(output.capture, *section) for section in sections]
+        for future in futures:
+            sys.stdout.write(future.result())
     
     print(f"\n{'='*70}")
     print("DIAGNOSTIC COMPLETE")